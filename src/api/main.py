@@ -1,6 +1,10 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import Dict, List, Optional
+import asyncio
+import hashlib
+import httpx
 import logging
 import os
 import tempfile
@@ -15,6 +19,8 @@ from ..core.metrics_collector import MetricsCollector
 from ..core.detection_service import IssueDetectionService
 from ..core.llm_engine import LLMReasoningEngine
 from ..core.remediation_generator import RemediationGenerator
+from ..core.analysis_cache import AnalysisCache, SemanticCache
+from ..core.analysis_batcher import AnalysisBatcher
 from ..core.resource_monitor import ResourceMonitor
 
 # Load environment variables
@@ -23,7 +29,8 @@ load_dotenv()
 app = FastAPI(
     title="KubeFix",
     description="AI-driven Kubernetes diagnostics and auto-remediation system",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS
@@ -39,27 +46,35 @@ app.add_middleware(
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_detection_service():
+async def get_detection_service():
     """Dependency to get detection service."""
     return app.state.detection_service
 
-def get_llm_engine():
+async def get_llm_engine():
     """Dependency to get LLM engine."""
     return app.state.llm_engine
 
-def get_remediation_generator():
+async def get_remediation_generator():
     """Dependency to get remediation generator."""
     return app.state.remediation_generator
 
+async def get_analysis_cache():
+    """Dependency to get the LLM analysis cache."""
+    return app.state.analysis_cache
+
+async def get_analysis_batcher():
+    """Dependency to get the LLM analysis batcher."""
+    return app.state.analysis_batcher
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize connections and clients on startup."""
     try:
         # Initialize Kubernetes client
-        k8s_client = KubernetesClient()
+        k8s_client = app.state.k8s_client = KubernetesClient()
         
         # Initialize metrics collector
-        metrics_collector = MetricsCollector(
+        metrics_collector = app.state.metrics_collector = MetricsCollector(
             prometheus_url=os.getenv("PROMETHEUS_URL", "http://prometheus:9090"),
             loki_url=os.getenv("LOKI_URL", "http://loki:3100")
         )
@@ -70,19 +85,48 @@ async def startup_event():
             metrics_collector=metrics_collector
         )
         
+        # Initialize a pooled HTTP client for the LLM provider
+        app.state.http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=60
+        )
+        
         # Initialize LLM engine
         app.state.llm_engine = LLMReasoningEngine(
-            openai_api_key=os.getenv("OPENAI_API_KEY")
+            openai_api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=app.state.http_client
+        )
+        
+        # Initialize LLM request batcher
+        app.state.analysis_batcher = AnalysisBatcher(
+            app.state.llm_engine,
+            max_batch=int(os.getenv("ANALYSIS_BATCH_SIZE", "8")),
+            max_delay=float(os.getenv("ANALYSIS_BATCH_DELAY", "0.025"))
+        )
+        app.state.analysis_batcher.start()
+        
+        # Initialize LLM analysis cache; both tiers expire on the same TTL
+        analysis_cache_ttl = int(os.getenv("ANALYSIS_CACHE_TTL", "600"))
+        app.state.analysis_cache = AnalysisCache(
+            maxsize=int(os.getenv("ANALYSIS_CACHE_SIZE", "1024")),
+            ttl=analysis_cache_ttl,
+            semantic=SemanticCache(
+                app.state.llm_engine.embeddings,
+                threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9")),
+                ttl=analysis_cache_ttl
+            )
         )
         
         # Initialize remediation generator
         app.state.remediation_generator = RemediationGenerator(
-            k8s_client=k8s_client.core_v1.api_client
+            k8s_client=k8s_client.api_client
         )
         
         # Start monitoring in background
-        background_tasks = BackgroundTasks()
-        background_tasks.add_task(app.state.detection_service.start_monitoring)
+        app.state._monitor_task = asyncio.create_task(
+            app.state.detection_service.start_monitoring()
+        )
         
     except Exception as e:
         logger.error(f"Error initializing services: {e}")
@@ -93,6 +137,12 @@ async def shutdown_event():
     """Clean up on shutdown."""
     try:
         await app.state.detection_service.stop_monitoring()
+        app.state._monitor_task.cancel()
+        await asyncio.gather(app.state._monitor_task, return_exceptions=True)
+        await app.state.analysis_batcher.stop()
+        await app.state.http_client.aclose()
+        app.state.k8s_client.close()
+        await app.state.metrics_collector.close()
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
 
@@ -110,13 +160,24 @@ async def health_check():
 
 @app.get("/api/v1/issues", response_model=List[IssueResponse])
 async def get_issues(
+    request: Request,
     namespace: Optional[str] = None,
     detection_service: IssueDetectionService = Depends(get_detection_service)
 ):
     """Get current issues in the cluster."""
     try:
-        issues = detection_service.get_active_issues(namespace)
-        return [IssueResponse(**issue) for issue in issues]
+        content = detection_service.get_active_issues_json(namespace)
+        
+        # Let clients skip unchanged payloads with If-None-Match
+        etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+            
+        return Response(
+            content=content,
+            media_type="application/json",
+            headers={"ETag": etag}
+        )
     except Exception as e:
         logger.error(f"Error getting issues: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -128,10 +189,10 @@ async def get_issue(
 ):
     """Get a specific issue by ID."""
     try:
-        issue = detection_service.get_issue_by_id(issue_id)
+        issue = detection_service.get_issue_json(issue_id)
         if not issue:
             raise HTTPException(status_code=404, detail="Issue not found")
-        return IssueResponse(**issue)
+        return Response(content=issue, media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
@@ -142,7 +203,8 @@ async def get_issue(
 async def analyze_issue(
     issue_id: str,
     detection_service: IssueDetectionService = Depends(get_detection_service),
-    llm_engine: LLMReasoningEngine = Depends(get_llm_engine)
+    analysis_cache: AnalysisCache = Depends(get_analysis_cache),
+    analysis_batcher: AnalysisBatcher = Depends(get_analysis_batcher)
 ):
     """Analyze an issue using the LLM engine."""
     try:
@@ -152,7 +214,10 @@ async def analyze_issue(
             raise HTTPException(status_code=404, detail="Issue not found")
             
         # Analyze the issue
-        analysis = await llm_engine.analyze_issue(issue)
+        analysis = await analysis_cache.get_or_analyze(
+            issue,
+            lambda: analysis_batcher.submit(issue)
+        )
         return analysis
     except HTTPException:
         raise
@@ -165,7 +230,9 @@ async def get_remediation(
     request: RemediationRequest,
     detection_service: IssueDetectionService = Depends(get_detection_service),
     llm_engine: LLMReasoningEngine = Depends(get_llm_engine),
-    remediation_generator: RemediationGenerator = Depends(get_remediation_generator)
+    remediation_generator: RemediationGenerator = Depends(get_remediation_generator),
+    analysis_cache: AnalysisCache = Depends(get_analysis_cache),
+    analysis_batcher: AnalysisBatcher = Depends(get_analysis_batcher)
 ):
     """Get remediation steps for an issue."""
     try:
@@ -175,10 +242,16 @@ async def get_remediation(
             raise HTTPException(status_code=404, detail="Issue not found")
             
         # Analyze the issue
-        analysis = await llm_engine.analyze_issue(issue)
+        analysis = await analysis_cache.get_or_analyze(
+            issue,
+            lambda: analysis_batcher.submit(issue)
+        )
         
         # Generate fixes
-        fixes = await llm_engine.generate_fix(analysis)
+        fixes = await analysis_cache.get_or_compute(
+            f"fix:{AnalysisCache.fingerprint(issue)}",
+            lambda: llm_engine.generate_fix(analysis)
+        )
         
         return RemediationResponse(
             issue_id=request.issue_id,
@@ -204,14 +277,16 @@ async def apply_patch(
     """Apply a remediation patch."""
     try:
         if request.patch_type == "yaml":
-            result = remediation_generator.apply_yaml_patch(
+            result = await asyncio.to_thread(
+                remediation_generator.apply_yaml_patch,
                 request.content,
                 namespace=request.namespace,
                 dry_run=request.dry_run
             )
         else:  # terraform
             with tempfile.TemporaryDirectory() as workspace:
-                result = remediation_generator.apply_terraform_patch(
+                result = await asyncio.to_thread(
+                    remediation_generator.apply_terraform_patch,
                     request.content,
                     workspace,
                     dry_run=request.dry_run
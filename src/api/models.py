@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -11,13 +11,22 @@ class IssueType(str, Enum):
     HPA_MISCONFIG = "hpa_misconfig"
     NETWORK_PERFORMANCE = "network_performance"
     DNS_HEALTH = "dns_health"
+    DNS_PERFORMANCE = "dns_performance"
+    
+    def __str__(self) -> str:
+        return self.value
 
 class IssueStatus(str, Enum):
     ACTIVE = "active"
     RESOLVED = "resolved"
     IN_PROGRESS = "in_progress"
+    
+    def __str__(self) -> str:
+        return self.value
 
 class IssueResponse(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    
     id: str
     type: IssueType
     status: IssueStatus
@@ -48,6 +57,7 @@ class RemediationStep(BaseModel):
     estimated_impact: str
     rollback_procedure: str
     validation_steps: List[str]
+    independent: bool = False
 
 class RemediationResponse(BaseModel):
     issue_id: str
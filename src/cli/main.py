@@ -1,15 +1,19 @@
-from typing import Optional
+from typing import List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import typer
+import yaml
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.progress import Progress, SpinnerColumn, TextColumn
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import json
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import urlencode
 
 # Initialize Typer app and Rich console
 app = typer.Typer(help="KubeFix CLI - AI-powered Kubernetes diagnostics and remediation")
@@ -18,21 +22,116 @@ console = Console()
 # Get API URL from environment or use default
 API_URL = os.getenv("KUBEFIX_API_URL", "http://localhost:8000")
 
+# Shared session so consecutive API calls reuse connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# Last ETag and body per GET endpoint, for conditional requests
+ETAG_CACHE_FILE = Path.home() / ".kubefix" / "etag-cache.json"
+
 def format_datetime(dt_str: str) -> str:
     """Format datetime string for display."""
+    # Fast path for ISO 8601 strings: "YYYY-MM-DDTHH:MM:SS[...]"
+    if len(dt_str) >= 19 and dt_str[10] == "T" and dt_str[4] == "-" and dt_str[13] == ":":
+        return dt_str[:10] + " " + dt_str[11:19]
     dt = datetime.fromisoformat(dt_str)
     return dt.strftime("%Y-%m-%d %H:%M:%S")
 
 def call_api(method: str, endpoint: str, **kwargs) -> dict:
     """Make API calls with error handling."""
     try:
-        response = requests.request(method, f"{API_URL}{endpoint}", **kwargs)
+        response = SESSION.request(method, f"{API_URL}{endpoint}", **kwargs)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
         console.print(f"[red]Error calling API: {str(e)}[/red]")
         raise typer.Exit(code=1)
 
+def load_etag_cache() -> dict:
+    """Load cached ETags and response bodies."""
+    try:
+        return json.loads(ETAG_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def save_etag_cache(cache: dict):
+    """Persist cached ETags and response bodies, ignoring write errors."""
+    try:
+        ETAG_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        ETAG_CACHE_FILE.write_text(json.dumps(cache))
+    except OSError:
+        pass
+
+def call_api_cached(endpoint: str, params: Optional[dict] = None):
+    """Make a conditional GET, reusing the cached body when the server answers 304."""
+    cache = load_etag_cache()
+    key = f"{endpoint}?{urlencode(sorted((params or {}).items()))}"
+    cached = cache.get(key)
+    headers = {"If-None-Match": cached["etag"]} if cached else {}
+    
+    try:
+        response = SESSION.get(f"{API_URL}{endpoint}", params=params, headers=headers)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        console.print(f"[red]Error calling API: {str(e)}[/red]")
+        raise typer.Exit(code=1)
+        
+    if response.status_code == 304 and cached:
+        return cached["body"]
+        
+    body = response.json()
+    if etag := response.headers.get("ETag"):
+        cache[key] = {"etag": etag, "body": body}
+        save_etag_cache(cache)
+    return body
+
+def step_targets(step: dict) -> Optional[Set[Tuple[str, str, str]]]:
+    """Get the (kind, namespace, name) objects a YAML step touches, or None if unknown."""
+    try:
+        targets = set()
+        for resource in yaml.safe_load_all(step["content"]):
+            if not resource:
+                continue
+            metadata = resource["metadata"]
+            targets.add((resource["kind"], metadata.get("namespace") or "default", metadata["name"]))
+        return targets or None
+    except Exception:
+        return None
+
+def group_steps(steps: List[dict]) -> List[List[dict]]:
+    """Split remediation steps into groups that can be applied concurrently.
+    
+    Steps run one at a time, in order, unless consecutive YAML steps are
+    explicitly marked independent and touch disjoint objects; those share a group.
+    """
+    groups: List[List[dict]] = []
+    group_targets: Set[Tuple[str, str, str]] = set()
+    for step in steps:
+        targets = step_targets(step) if step["action_type"] == "yaml" and step.get("independent") else None
+        if (
+            targets is not None and groups and group_targets
+            and not targets & group_targets
+        ):
+            groups[-1].append(step)
+            group_targets |= targets
+        else:
+            groups.append([step])
+            group_targets = targets or set()
+    return groups
+
+def apply_step(step: dict) -> dict:
+    """Apply a single remediation step through the API."""
+    return call_api(
+        "POST",
+        "/api/v1/apply-patch",
+        json={
+            "patch_type": step["action_type"],
+            "content": step["content"],
+            "dry_run": False
+        }
+    )
+
 @app.command()
 def status():
     """Check the status of KubeFix services."""
@@ -66,7 +165,7 @@ def list_issues(
     ) as progress:
         progress.add_task(description="Fetching issues...", total=None)
         params = {"namespace": namespace} if namespace else {}
-        issues = call_api("GET", "/api/v1/issues", params=params)
+        issues = call_api_cached("/api/v1/issues", params=params)
         
     if severity:
         issues = [i for i in issues if i["severity"].lower() == severity.lower()]
@@ -80,8 +179,8 @@ def list_issues(
     table.add_column("Severity", style="red")
     table.add_column("Detected", style="white")
     
-    for issue in issues:
-        table.add_row(
+    rows = (
+        (
             issue["id"][:8],
             issue["type"],
             issue["status"],
@@ -90,6 +189,10 @@ def list_issues(
             issue["severity"].upper(),
             format_datetime(issue["detected_at"])
         )
+        for issue in issues
+    )
+    for row in rows:
+        table.add_row(*row)
         
     console.print(table)
     console.print(f"\nTotal issues: {len(issues)}")
@@ -190,22 +293,19 @@ def fix(
             transient=True,
         ) as progress:
             progress.add_task(description="Applying changes...", total=None)
-            for step in remediation["steps"]:
-                result = call_api(
-                    "POST",
-                    "/api/v1/apply-patch",
-                    json={
-                        "patch_type": step["action_type"],
-                        "content": step["content"],
-                        "dry_run": False
-                    }
-                )
-                if result["success"]:
-                    console.print(f"[green]✓ Applied: {step['description']}[/green]")
-                else:
-                    console.print(f"[red]✗ Failed: {step['description']}[/red]")
-                    console.print(f"Error: {result['details'].get('error', 'Unknown error')}")
-                    break
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                # Apply group by group so a failure stops later groups
+                for group in group_steps(remediation["steps"]):
+                    failed = False
+                    for step, result in zip(group, executor.map(apply_step, group)):
+                        if result["success"]:
+                            console.print(f"[green]✓ Applied: {step['description']}[/green]")
+                        else:
+                            console.print(f"[red]✗ Failed: {step['description']}[/red]")
+                            console.print(f"Error: {result['details'].get('error', 'Unknown error')}")
+                            failed = True
+                    if failed:
+                        break
 
 if __name__ == "__main__":
     app()
\ No newline at end of file
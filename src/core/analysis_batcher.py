@@ -0,0 +1,85 @@
+from typing import Any, Dict, List, Set, Tuple
+import asyncio
+import logging
+from .llm_engine import LLMReasoningEngine, AnalysisResponse
+
+logger = logging.getLogger(__name__)
+
+class AnalysisBatcher:
+    """Collect concurrent analysis requests and send them to the LLM in batches."""
+
+    def __init__(
+        self,
+        llm_engine: LLMReasoningEngine,
+        max_batch: int = 8,
+        max_delay: float = 0.025
+    ):
+        self.llm_engine = llm_engine
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker = None
+        self._dispatches: Set[asyncio.Task] = set()
+
+    def start(self):
+        """Start the background worker on the running event loop."""
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker and wait for in-flight batches to finish."""
+        if self._worker:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+        await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+    async def submit(self, issue: Dict[str, Any]) -> AnalysisResponse:
+        """Queue an issue for analysis and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((issue, future))
+        return await future
+
+    async def _run(self):
+        """Drain the queue into batches of up to max_batch or max_delay seconds."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Skip callers that gave up while waiting
+            batch = [(issue, future) for issue, future in batch if not future.done()]
+            if batch:
+                task = asyncio.create_task(self._dispatch(batch))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Analyze a batch, falling back to per-issue calls if the batch fails."""
+        issues = [issue for issue, _ in batch]
+        try:
+            results: List[Any] = await self.llm_engine.analyze_issues_batch(issues)
+        except Exception as e:
+            if len(issues) == 1:
+                results = [e]
+            else:
+                logger.warning(f"Batch analysis of {len(issues)} issues failed, retrying individually: {e}")
+                results = await asyncio.gather(
+                    *(self.llm_engine.analyze_issue(issue) for issue in issues),
+                    return_exceptions=True
+                )
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,140 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from cachetools import TTLCache
+import numpy as np
+import bisect
+import hashlib
+import orjson
+import logging
+import time
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Issue fields that determine what the LLM will say about it
+FINGERPRINT_FIELDS = (
+    "type", "severity", "namespace", "resource_name",
+    "resource_type", "message", "metrics"
+)
+
+# Detector evidence that distinguishes issues sharing a fixed per-type message
+EVIDENCE_FIELDS = (
+    "events", "logs", "conditions", "container_issues",
+    "metrics", "current_metrics", "target_resource"
+)
+
+class SemanticCache:
+    """Similarity cache that matches near-duplicate issues by description embedding."""
+
+    def __init__(self, embeddings, threshold: float = 0.9, maxsize: int = 512, ttl: int = 600):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._vectors: Optional[np.ndarray] = None  # (N, D), rows L2-normalized
+        self._values: List[Any] = []
+        self._expires: List[float] = []  # monotonic expiry per row, oldest first
+
+    @staticmethod
+    def describe(issue: Dict[str, Any]) -> str:
+        """Text used to embed an issue: its message plus the evidence behind it."""
+        lines = [
+            f"{issue.get('type')} {issue.get('resource_type')} in {issue.get('namespace')}: "
+            f"{issue.get('message', '')}"
+        ]
+        for field in EVIDENCE_FIELDS:
+            value = issue.get(field)
+            if not value:
+                continue
+            if field == "events":
+                # Counts and timestamps change on every occurrence; reasons and messages do not
+                value = [(event.get("reason"), event.get("message")) for event in value]
+            encoded = orjson.dumps(value, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+            lines.append(f"{field}: {encoded.decode()}")
+        return "\n".join(lines)
+
+    async def embed(self, issue: Dict[str, Any]) -> np.ndarray:
+        """Embed an issue description as a unit vector."""
+        vector = np.asarray(
+            await self.embeddings.aembed_query(self.describe(issue)),
+            dtype=np.float32
+        )
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _expire(self):
+        """Drop entries older than the TTL; rows are kept in insertion order."""
+        expired = bisect.bisect_right(self._expires, time.monotonic())
+        if expired:
+            del self._values[:expired]
+            del self._expires[:expired]
+            self._vectors = self._vectors[expired:] if self._values else None
+
+    def lookup(self, query: np.ndarray) -> Optional[Any]:
+        """Return the cached value most similar to query, if above threshold."""
+        self._expire()
+        if self._vectors is None:
+            return None
+
+        # Rows are unit vectors, so the dot product is the cosine similarity
+        scores = self._vectors @ query
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return self._values[best]
+        return None
+
+    def add(self, query: np.ndarray, value: Any):
+        """Store a value under its embedding, evicting expired and then the oldest entries."""
+        self._expire()
+        if self._vectors is None:
+            self._vectors = query[np.newaxis, :]
+        else:
+            self._vectors = np.vstack([self._vectors, query])[-self.maxsize:]
+        self._values.append(value)
+        del self._values[:-self.maxsize]
+        self._expires.append(time.monotonic() + self.ttl)
+        del self._expires[:-self.maxsize]
+
+class AnalysisCache:
+    """In-process TTL cache for LLM results, keyed by issue fingerprint."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: int = 600,
+        semantic: Optional[SemanticCache] = None
+    ):
+        self._flight = SingleFlight(TTLCache(maxsize=maxsize, ttl=ttl))
+        self.semantic = semantic
+
+    @staticmethod
+    def fingerprint(issue: Dict[str, Any]) -> str:
+        """Build a stable hash of the semantic fields of an issue."""
+        payload = {field: issue.get(field) for field in FINGERPRINT_FIELDS}
+        encoded = orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, computing it at most once per TTL."""
+        return await self._flight.do(key, compute)
+
+    async def get_or_analyze(self, issue: Dict[str, Any], compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Look up an analysis by exact fingerprint, then by similarity, before computing it."""
+        async def lookup_or_compute():
+            if self.semantic is None:
+                return await compute()
+
+            try:
+                query = await self.semantic.embed(issue)
+            except Exception as e:
+                logger.error(f"Error embedding issue for semantic cache: {e}")
+                return await compute()
+
+            cached = self.semantic.lookup(query)
+            if cached is not None:
+                return cached
+
+            value = await compute()
+            self.semantic.add(query, value)
+            return value
+
+        return await self.get_or_compute(self.fingerprint(issue), lookup_or_compute)
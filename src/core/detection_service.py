@@ -1,8 +1,13 @@
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any, Set, Tuple
+from collections import defaultdict, deque
 from datetime import datetime
 import asyncio
 import logging
+import time
 import uuid
+import orjson
+from pydantic import ValidationError
+from ..api.models import IssueResponse, IssueStatus, IssueType
 from .kubernetes_client import KubernetesClient
 from .metrics_collector import MetricsCollector
 from .resource_monitor import ResourceMonitor
@@ -20,7 +25,15 @@ class IssueDetectionService:
         self.metrics = metrics_collector
         self.monitor = ResourceMonitor(k8s_client)
         self.detector = IssueDetector(k8s_client, metrics_collector, self.monitor)
-        self.issues: Dict[str, Dict[str, Any]] = {}
+        # Keyed by the issue UUID as an int; the hex form is only used at the API boundary
+        self.issues: Dict[int, Dict[str, Any]] = {}
+        # Serialized IssueResponse per issue, rebuilt whenever the issue changes
+        self._issue_json: Dict[int, bytes] = {}
+        # Secondary indexes over self.issues, kept in sync on every mutation
+        self._by_status: Dict[IssueStatus, Set[int]] = defaultdict(set)
+        self._by_ns: Dict[str, Set[int]] = defaultdict(set)
+        # (monotonic resolve time, issue key), oldest first
+        self._resolved_queue: Deque[Tuple[float, int]] = deque()
         self._running = False
         
     async def start_monitoring(self):
@@ -41,66 +54,109 @@ class IssueDetectionService:
     async def _scan_all_namespaces(self):
         """Scan all namespaces for issues."""
         try:
-            namespaces = self.k8s.core_v1.list_namespace()
+            namespaces = await asyncio.to_thread(
+                self.k8s.list_from_cache, self.k8s.core_v1.list_namespace
+            )
+            namespace_names = [ns.metadata.name for ns in namespaces]
             
-            for ns in namespaces.items:
-                namespace = ns.metadata.name
-                issues = self.detector.scan_namespace(namespace)
-                
-                # Update issues dictionary
-                current_time = datetime.now().isoformat()
+            # Scan namespaces concurrently
+            results = await asyncio.gather(*(
+                self.detector.scan_namespace(namespace)
+                for namespace in namespace_names
+            ))
+            
+            # Update issues dictionary
+            current_time = datetime.now().isoformat()
+            for namespace, issues in zip(namespace_names, results):
                 for issue in issues:
-                    issue_id = str(uuid.uuid4())
-                    self.issues[issue_id] = {
-                        "id": issue_id,
+                    issue_uuid = uuid.uuid4()
+                    key = issue_uuid.int
+                    record = {
+                        "id": issue_uuid.hex,
+                        "description": issue.get("message", ""),
                         **issue,
                         "detected_at": current_time,
-                        "status": "active"
+                        "status": IssueStatus.ACTIVE
                     }
                     
-                # Clean up resolved issues
-                self._clean_resolved_issues()
+                    # Validate and serialize once here so readers skip both
+                    try:
+                        # Intern the enum member so validation is an isinstance check
+                        record["type"] = IssueType(record["type"])
+                        self._issue_json[key] = self._serialize(record)
+                    except (ValueError, ValidationError) as e:
+                        logger.warning(f"Dropping invalid issue in namespace {namespace}: {e}")
+                        continue
+                    
+                    self.issues[key] = record
+                    self._by_status[IssueStatus.ACTIVE].add(key)
+                    self._by_ns[namespace].add(key)
+                    
+            # Clean up resolved issues
+            self._clean_resolved_issues()
                 
         except Exception as e:
             logger.error(f"Error scanning namespaces: {e}")
             
+    @staticmethod
+    def _key(issue_id: str) -> Optional[int]:
+        """Convert an API issue id to its internal key."""
+        try:
+            return uuid.UUID(issue_id).int
+        except ValueError:
+            return None
+            
+    @staticmethod
+    def _serialize(record: Dict[str, Any]) -> bytes:
+        """Validate an issue record and serialize it as an IssueResponse."""
+        return orjson.dumps(IssueResponse.model_validate(record).model_dump())
+        
     def _clean_resolved_issues(self):
-        """Remove resolved issues that are older than 24 hours."""
-        current_time = datetime.now()
-        to_remove = []
+        """Remove issues that were resolved more than 24 hours ago."""
+        cutoff = time.monotonic() - 86400  # 24 hours
         
-        for issue_id, issue in self.issues.items():
-            detected_time = datetime.fromisoformat(issue["detected_at"])
-            if (
-                issue["status"] == "resolved" and
-                (current_time - detected_time).total_seconds() > 86400  # 24 hours
-            ):
-                to_remove.append(issue_id)
-                
-        for issue_id in to_remove:
-            del self.issues[issue_id]
+        while self._resolved_queue and self._resolved_queue[0][0] < cutoff:
+            _, key = self._resolved_queue.popleft()
+            issue = self.issues.pop(key, None)
+            if issue is None:
+                continue
+            self._issue_json.pop(key, None)
+            self._by_status[issue["status"]].discard(key)
+            self._by_ns[issue["namespace"]].discard(key)
+            
+    def _active_issue_keys(self, namespace: Optional[str] = None) -> Set[int]:
+        """Get the keys of all active issues, optionally filtered by namespace."""
+        keys = self._by_status[IssueStatus.ACTIVE]
+        if namespace:
+            keys = keys & self._by_ns.get(namespace, set())
+        return keys
             
     def get_active_issues(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all active issues, optionally filtered by namespace."""
-        issues = [
-            issue for issue in self.issues.values()
-            if issue["status"] == "active"
-        ]
+        return [self.issues[key] for key in self._active_issue_keys(namespace)]
         
-        if namespace:
-            issues = [
-                issue for issue in issues
-                if issue["namespace"] == namespace
-            ]
-            
-        return issues
+    def get_active_issues_json(self, namespace: Optional[str] = None) -> bytes:
+        """Get all active issues as a serialized JSON array."""
+        return b"[" + b",".join(
+            self._issue_json[key] for key in self._active_issue_keys(namespace)
+        ) + b"]"
         
     def get_issue_by_id(self, issue_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific issue by ID."""
-        return self.issues.get(issue_id)
+        return self.issues.get(self._key(issue_id))
+        
+    def get_issue_json(self, issue_id: str) -> Optional[bytes]:
+        """Get a specific issue by ID as serialized JSON."""
+        return self._issue_json.get(self._key(issue_id))
         
     def mark_issue_resolved(self, issue_id: str):
         """Mark an issue as resolved."""
-        if issue_id in self.issues:
-            self.issues[issue_id]["status"] = "resolved"
-            self.issues[issue_id]["resolved_at"] = datetime.now().isoformat()
\ No newline at end of file
+        key = self._key(issue_id)
+        issue = self.issues.get(key)
+        if issue is not None and issue["status"] != IssueStatus.RESOLVED:
+            self._by_status[issue["status"]].discard(key)
+            self._by_status[IssueStatus.RESOLVED].add(key)
+            self._resolved_queue.append((time.monotonic(), key))
+            issue["status"] = IssueStatus.RESOLVED
+            issue["resolved_at"] = datetime.now().isoformat()
+            self._issue_json[key] = self._serialize(issue)
\ No newline at end of file
@@ -0,0 +1,105 @@
+from typing import Any, Callable, Dict, List, Optional
+from collections import defaultdict
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class ResourceInformer:
+    """Keep a local cache of one resource kind in sync with a list-then-watch loop."""
+
+    def __init__(
+        self,
+        list_func: Callable,
+        sync_timeout: float = 30,
+        watch_timeout: int = 300,
+        **list_kwargs: Any
+    ):
+        self.list_func = list_func
+        self.sync_timeout = sync_timeout
+        self.watch_timeout = watch_timeout
+        self.list_kwargs = list_kwargs
+        self._lock = threading.RLock()
+        # namespace -> name -> object
+        self._objects: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        self._resource_version: Optional[str] = None
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._watch: Optional[watch.Watch] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the list/watch loop in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"informer-{self.list_func.__name__}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the list/watch loop."""
+        self._stopped.set()
+        if self._watch:
+            self._watch.stop()
+
+    def list(self, namespace: str) -> List[Any]:
+        """Get the cached objects in a namespace, waiting for the initial list if needed."""
+        if not self._synced.wait(self.sync_timeout):
+            logger.warning(f"Informer for {self.list_func.__name__} has not synced yet")
+        with self._lock:
+            return list(self._objects.get(namespace, {}).values())
+
+    def _relist(self):
+        """Replace the cache with a full list served from the API server's watch cache."""
+        result = self.list_func(resource_version="0", **self.list_kwargs)
+        objects: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        for obj in result.items:
+            objects[obj.metadata.namespace][obj.metadata.name] = obj
+        with self._lock:
+            self._objects = objects
+        self._resource_version = result.metadata.resource_version
+        self._synced.set()
+
+    def _apply(self, event: Dict[str, Any]):
+        """Apply a single watch event to the cache."""
+        obj = event["object"]
+        namespace, name = obj.metadata.namespace, obj.metadata.name
+        with self._lock:
+            if event["type"] == "DELETED":
+                self._objects[namespace].pop(name, None)
+            else:
+                self._objects[namespace][name] = obj
+
+    def _run(self):
+        """List once, then watch from the listed resourceVersion until stopped."""
+        while not self._stopped.is_set():
+            try:
+                if self._resource_version is None:
+                    self._relist()
+
+                self._watch = watch.Watch()
+                for event in self._watch.stream(
+                    self.list_func,
+                    resource_version=self._resource_version,
+                    timeout_seconds=self.watch_timeout,
+                    **self.list_kwargs
+                ):
+                    if event["type"] in ("ADDED", "MODIFIED", "DELETED"):
+                        self._apply(event)
+                    self._resource_version = self._watch.resource_version
+
+            except ApiException as e:
+                if e.status == 410:
+                    # Our resourceVersion fell out of the watch window; resync
+                    logger.info(f"Watch for {self.list_func.__name__} expired, relisting")
+                    self._resource_version = None
+                else:
+                    logger.error(f"Error watching {self.list_func.__name__}: {e}")
+                    time.sleep(5)
+            except Exception as e:
+                logger.error(f"Error watching {self.list_func.__name__}: {e}")
+                time.sleep(5)
@@ -1,50 +1,62 @@
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
+import asyncio
 import logging
 from .kubernetes_client import KubernetesClient
 from .metrics_collector import MetricsCollector
 from .resource_monitor import ResourceMonitor
-from .network_detector import NetworkIssueDetector
+from .network_detector import NetworkIssueDetector, POD_SCHEDULED_FALSE
 
 logger = logging.getLogger(__name__)
 
+# Lowercase substring of a scheduling message that names a PVC
+PV_KEYWORD = "persistentvolumeclaim"
+
 class IssueDetector:
     def __init__(
         self,
         k8s_client: KubernetesClient,
         metrics_collector: MetricsCollector,
-        resource_monitor: ResourceMonitor
+        resource_monitor: ResourceMonitor,
+        max_concurrent_pods: int = 16
     ):
         self.k8s = k8s_client
         self.metrics = metrics_collector
         self.monitor = resource_monitor
         self.network_detector = NetworkIssueDetector(k8s_client, metrics_collector)
+        # Caps in-flight per-pod checks across all namespaces being scanned
+        self._pod_slots = asyncio.Semaphore(max_concurrent_pods)
         
     def detect_crash_loops(self, pod_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Detect crash loop issues in pods."""
         for container in pod_state["container_states"]:
+            # Healthy containers are running, so the state check rejects them first
             if (
-                container["restart_count"] > 3 and
-                container["state"]["type"] == "waiting" and
-                container["state"]["reason"] == "CrashLoopBackOff"
+                container.state_type == "waiting" and
+                container.reason == "CrashLoopBackOff" and
+                container.restart_count > 3
             ):
                 return {
                     "type": "crash_loop",
                     "severity": "high",
-                    "container": container["name"],
-                    "restart_count": container["restart_count"],
-                    "message": container["state"]["message"]
+                    "container": container.name,
+                    "restart_count": container.restart_count,
+                    "message": container.message
                 }
         return None
         
-    def detect_oom_kills(self, pod_name: str, namespace: str) -> Optional[Dict[str, Any]]:
-        """Detect OOMKill issues using metrics and events."""
-        events = self.k8s.get_pod_events(pod_name, namespace)
-        metrics = self.metrics.get_pod_metrics(pod_name, namespace)
+    async def detect_oom_kills(
+        self,
+        pod_name: str,
+        namespace: str,
+        metrics: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Detect OOMKill issues using prefetched metrics and events."""
+        events = await asyncio.to_thread(self.k8s.get_cached_events, pod_name, namespace)
         
         oom_events = [
             e for e in events
-            if e["reason"] == "OOMKilled" or "OOMKilling" in e.get("message", "")
+            if e["reason"] == "OOMKilled" or "OOMKilling" in (e["message"] or "")
         ]
         
         if oom_events:
@@ -60,9 +72,9 @@ class IssueDetector:
     def detect_pv_mount_errors(self, pod_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Detect persistent volume mount issues."""
         mount_conditions = [
-            c for c in pod_state["conditions"]
-            if c["type"] == "PodScheduled" and c["status"] == "False"
-            and "persistentvolumeclaim" in c.get("message", "").lower()
+            c._asdict() for c in pod_state["conditions"]
+            if (c.type, c.status) == POD_SCHEDULED_FALSE
+            and PV_KEYWORD in (c.message or "").lower()
         ]
         
         if mount_conditions:
@@ -74,15 +86,13 @@ class IssueDetector:
             }
         return None
         
-    def detect_hpa_misconfig(self, namespace: str) -> List[Dict[str, Any]]:
+    async def detect_hpa_misconfig(self, namespace: str) -> List[Dict[str, Any]]:
         """Detect HPA misconfiguration issues."""
         issues = []
         try:
-            hpas = self.k8s.autoscaling_v1.list_namespaced_horizontal_pod_autoscaler(namespace)
-            
-            for hpa in hpas.items:
+            for hpa in await asyncio.to_thread(self.k8s.get_cached_hpas, namespace):
                 if not hpa.status.current_replicas and hpa.status.desired_replicas:
-                    metrics = self.metrics.get_pod_metrics(
+                    metrics = await self.metrics.get_pod_metrics(
                         hpa.spec.scale_target_ref.name,
                         namespace
                     )
@@ -101,12 +111,12 @@ class IssueDetector:
             
         return issues
 
-    def detect_network_issues(self, pod_name: str, namespace: str, pod_state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def detect_network_issues(self, pod_name: str, namespace: str, pod_state: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Detect DNS and CNI related issues."""
         issues = []
         
         # Check for DNS failures
-        if dns_issue := self.network_detector.detect_dns_failures(pod_name, namespace):
+        if dns_issue := await self.network_detector.detect_dns_failures(pod_name, namespace):
             issues.append(dns_issue)
             
         # Check for CNI failures
@@ -115,83 +125,82 @@ class IssueDetector:
             
         return issues
         
-    def analyze_cluster_network_health(self, namespace: str) -> List[Dict[str, Any]]:
+    async def analyze_cluster_network_health(self, namespace: str) -> List[Dict[str, Any]]:
         """Analyze overall network health metrics."""
-        issues = []
-        
-        # Check network performance metrics
-        issues.extend(self.network_detector.check_network_metrics(namespace))
-        
-        # Analyze DNS health metrics
-        issues.extend(self.network_detector.analyze_dns_metrics(namespace))
-        
-        return issues
+        # Network performance and DNS health metrics are independent queries
+        performance_issues, dns_issues = await asyncio.gather(
+            self.network_detector.check_network_metrics(namespace),
+            self.network_detector.analyze_dns_metrics(namespace)
+        )
+        return performance_issues + dns_issues
+
+    async def _scan_pod(
+        self,
+        pod,
+        namespace: str,
+        pod_metrics: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Run all per-pod checks for a single pod."""
+        async with self._pod_slots:
+            issues = []
+            pod_state = self.monitor.get_pod_state(pod)
+            pod_name = pod.metadata.name
+            
+            # Check for crash loops
+            if crash_issue := self.detect_crash_loops(pod_state):
+                issues.append(crash_issue)
+            
+            # Check for OOMKills
+            metrics = pod_metrics.get(pod_name, {})
+            if oom_issue := await self.detect_oom_kills(pod_name, namespace, metrics):
+                issues.append(oom_issue)
+            
+            # Check for PV mount errors
+            if pv_issue := self.detect_pv_mount_errors(pod_state):
+                issues.append(pv_issue)
+            
+            # Network-related checks
+            issues.extend(await self.detect_network_issues(pod_name, namespace, pod_state))
+            
+            # The detectors build fresh dicts, so tag them in place
+            for issue in issues:
+                issue.update(namespace=namespace, resource_name=pod_name, resource_type="Pod")
+            
+            return issues
 
-    def scan_namespace(self, namespace: str) -> List[Dict[str, Any]]:
+    async def scan_namespace(self, namespace: str) -> List[Dict[str, Any]]:
         """Scan a namespace for all types of issues."""
         issues = []
         
         try:
-            pods = self.k8s.core_v1.list_namespaced_pod(namespace)
+            # Two namespace-wide Prometheus queries instead of two per pod
+            pods, pod_metrics = await asyncio.gather(
+                asyncio.to_thread(self.k8s.get_cached_pods, namespace),
+                self.metrics.get_namespace_pod_metrics(namespace)
+            )
             
-            for pod in pods.items:
-                pod_state = self.monitor.get_pod_state(pod)
-                pod_name = pod.metadata.name
-                
-                # Check for crash loops
-                if crash_issue := self.detect_crash_loops(pod_state):
-                    issues.append({
-                        **crash_issue,
-                        "namespace": namespace,
-                        "resource_name": pod_name,
-                        "resource_type": "Pod"
-                    })
-                
-                # Check for OOMKills
-                if oom_issue := self.detect_oom_kills(pod_name, namespace):
-                    issues.append({
-                        **oom_issue,
-                        "namespace": namespace,
-                        "resource_name": pod_name,
-                        "resource_type": "Pod"
-                    })
-                
-                # Check for PV mount errors
-                if pv_issue := self.detect_pv_mount_errors(pod_state):
-                    issues.append({
-                        **pv_issue,
-                        "namespace": namespace,
-                        "resource_name": pod_name,
-                        "resource_type": "Pod"
-                    })
-                
-                # Network-related checks
-                network_issues = self.detect_network_issues(pod_name, namespace, pod_state)
-                issues.extend([
-                    {
-                        **issue,
-                        "namespace": namespace,
-                        "resource_name": pod_name,
-                        "resource_type": "Pod"
-                    }
-                    for issue in network_issues
-                ])
+            # Pod checks and namespace-wide checks all wait on I/O, so run them together
+            *pod_issues, hpa_issues, cluster_network_issues = await asyncio.gather(
+                *(self._scan_pod(pod, namespace, pod_metrics) for pod in pods),
+                self.detect_hpa_misconfig(namespace),
+                self.analyze_cluster_network_health(namespace)
+            )
+            
+            for sub in pod_issues:
+                issues.extend(sub)
             
             # Check for HPA issues
-            hpa_issues = self.detect_hpa_misconfig(namespace)
-            issues.extend([
-                {**issue, "namespace": namespace, "resource_type": "HorizontalPodAutoscaler"}
-                for issue in hpa_issues
-            ])
+            for issue in hpa_issues:
+                issue.update(namespace=namespace, resource_type="HorizontalPodAutoscaler")
+            issues.extend(hpa_issues)
             
-            # Check cluster-wide network health
-            cluster_network_issues = self.analyze_cluster_network_health(namespace)
-            issues.extend([
-                {**issue, "namespace": namespace, "resource_type": "Cluster"}
-                for issue in cluster_network_issues
-            ])
+            # Check cluster-wide network health; DNS metric issues name no resource
+            for issue in cluster_network_issues:
+                issue.update(namespace=namespace, resource_type="Cluster")
+                issue.setdefault("resource_name", "cluster")
+            issues.extend(cluster_network_issues)
             
         except Exception as e:
             logger.error(f"Error scanning namespace {namespace}: {e}")
             
-        return issues
\ No newline at end of file
+        return issues
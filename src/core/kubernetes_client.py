@@ -1,21 +1,56 @@
 from kubernetes import client, config, watch
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 import logging
+from .informer import ResourceInformer
 
 logger = logging.getLogger(__name__)
 
 class KubernetesClient:
-    def __init__(self):
+    def __init__(self, pool_maxsize: int = 64):
         """Initialize Kubernetes client with in-cluster or kubeconfig configuration."""
         try:
             config.load_incluster_config()
         except config.ConfigException:
             config.load_kube_config()
         
-        self.core_v1 = client.CoreV1Api()
-        self.apps_v1 = client.AppsV1Api()
-        self.autoscaling_v1 = client.AutoscalingV1Api()
-        self.custom_objects = client.CustomObjectsApi()
+        # Share one ApiClient (and its urllib3 pool) across all API groups
+        configuration = client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = pool_maxsize
+        self.api_client = client.ApiClient(configuration)
+        
+        self.core_v1 = client.CoreV1Api(self.api_client)
+        self.apps_v1 = client.AppsV1Api(self.api_client)
+        self.autoscaling_v1 = client.AutoscalingV1Api(self.api_client)
+        self.custom_objects = client.CustomObjectsApi(self.api_client)
+        
+        # Watch-backed caches so scans never list or get per pod
+        self.pod_informer = ResourceInformer(self.core_v1.list_pod_for_all_namespaces)
+        self.event_informer = ResourceInformer(
+            self.core_v1.list_event_for_all_namespaces,
+            field_selector="involvedObject.kind=Pod,type=Warning"
+        )
+        self.hpa_informer = ResourceInformer(
+            self.autoscaling_v1.list_horizontal_pod_autoscaler_for_all_namespaces
+        )
+        self._informers = (self.pod_informer, self.event_informer, self.hpa_informer)
+        for informer in self._informers:
+            informer.start()
+            
+    def close(self):
+        """Stop the background watches."""
+        for informer in self._informers:
+            informer.stop()
+        
+    def list_from_cache(self, list_func, limit: int = 500, **kwargs) -> List[Any]:
+        """List all objects, letting the API server answer from its watch cache."""
+        # resourceVersion=0 may be served without an etcd read; pages after the first
+        # must not repeat it alongside the continue token
+        result = list_func(resource_version="0", limit=limit, **kwargs)
+        items = list(result.items)
+        while result.metadata._continue:
+            result = list_func(limit=limit, _continue=result.metadata._continue, **kwargs)
+            items.extend(result.items)
+        return items
         
     def watch_pods(self, namespace: Optional[str] = None) -> watch.Watch:
         """Watch pod events in the specified namespace or all namespaces."""
@@ -25,23 +60,68 @@ class KubernetesClient:
             namespace=namespace if namespace else ""
         )
         
-    def get_pod_logs(self, name: str, namespace: str) -> str:
-        """Get logs for a specific pod."""
+    @staticmethod
+    def _event_summary(event: client.CoreV1Event) -> Dict[str, Any]:
+        """Project the event fields detectors read, skipping a full to_dict() walk."""
+        return {
+            "reason": event.reason,
+            "message": event.message,
+            "count": event.count,
+            "last_timestamp": event.last_timestamp
+        }
+        
+    def get_cached_pods(self, namespace: str) -> List[client.V1Pod]:
+        """Get the pods in a namespace from the watch cache."""
+        return self.pod_informer.list(namespace)
+        
+    def get_cached_events(self, name: str, namespace: str) -> List[Dict[str, Any]]:
+        """Get warning events for a specific pod from the watch cache."""
+        return [
+            self._event_summary(event) for event in self.event_informer.list(namespace)
+            if event.involved_object.name == name
+        ]
+        
+    def get_cached_hpas(self, namespace: str) -> List[client.V1HorizontalPodAutoscaler]:
+        """Get the HPAs in a namespace from the watch cache."""
+        return self.hpa_informer.list(namespace)
+        
+    def iter_pod_logs(
+        self,
+        name: str,
+        namespace: str,
+        tail_lines: int = 2000,
+        since_seconds: int = 300,
+        limit_bytes: int = 1_000_000,
+        chunk_size: int = 65536
+    ) -> Iterator[str]:
+        """Stream recent logs for a specific pod as chunks of whole lines."""
         try:
-            return self.core_v1.read_namespaced_pod_log(name=name, namespace=namespace)
+            resp = self.core_v1.read_namespaced_pod_log(
+                name=name,
+                namespace=namespace,
+                tail_lines=tail_lines,
+                since_seconds=since_seconds,
+                limit_bytes=limit_bytes,
+                _preload_content=False
+            )
         except Exception as e:
             logger.error(f"Error getting logs for pod {name} in namespace {namespace}: {e}")
-            return ""
-
-    def get_pod_events(self, name: str, namespace: str) -> List[Dict[str, Any]]:
-        """Get events for a specific pod."""
+            return
+            
         try:
-            field_selector = f"involvedObject.name={name}"
-            events = self.core_v1.list_namespaced_event(
-                namespace=namespace,
-                field_selector=field_selector
-            )
-            return [event.to_dict() for event in events.items]
+            partial = b""
+            for chunk in resp.stream(chunk_size):
+                chunk = partial + chunk
+                # Hold back the trailing partial line until the next chunk completes it
+                cut = chunk.rfind(b"\n") + 1
+                partial = chunk[cut:]
+                if cut:
+                    yield chunk[:cut].decode("utf-8", errors="replace")
+            if partial:
+                yield partial.decode("utf-8", errors="replace")
         except Exception as e:
-            logger.error(f"Error getting events for pod {name} in namespace {namespace}: {e}")
-            return []
\ No newline at end of file
+            logger.error(f"Error streaming logs for pod {name} in namespace {namespace}: {e}")
+        finally:
+            # Callers may stop early; drop the connection rather than drain it
+            resp.close()
+            resp.release_conn()
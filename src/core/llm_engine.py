@@ -1,12 +1,17 @@
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from langchain.chat_models import ChatOpenAI
+from langchain.embeddings import OpenAIEmbeddings
+from langchain.callbacks.base import BaseCallbackHandler
 from langchain.chains import LLMChain
-from langchain.prompts import PromptTemplate
 from langchain.output_parsers import PydanticOutputParser
+from langchain.prompts import PromptTemplate
 from pydantic import BaseModel, Field
-import json
+import httpx
+import openai
+import orjson
 import logging
-from .prompts.issue_analysis import PROMPT_TEMPLATES
+import tiktoken
+from .prompts.issue_analysis import PROMPT_TEMPLATES, BATCH_ANALYSIS_TEMPLATE, FIX_GENERATION_TEMPLATE
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +27,10 @@ class RemediationStep(BaseModel):
     estimated_impact: str = Field(description="Potential impact of applying this step")
     rollback_procedure: str = Field(description="How to rollback this change if needed")
     validation_steps: List[str] = Field(description="Steps to validate the fix")
+    independent: bool = Field(
+        default=False,
+        description="True only if this step does not depend on, and can run alongside, the steps next to it"
+    )
 
 class PreventiveMeasure(BaseModel):
     description: str = Field(description="Description of the preventive measure")
@@ -33,62 +42,235 @@ class AnalysisResponse(BaseModel):
     remediation_steps: List[RemediationStep]
     preventive_measures: List[PreventiveMeasure]
 
+class BatchAnalysisResponse(BaseModel):
+    analyses: List[AnalysisResponse] = Field(description="One analysis per issue, in the order given")
+
+class DebugLogCallbackHandler(BaseCallbackHandler):
+    """Log LLM prompts and completions at DEBUG level instead of printing them."""
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            for prompt in prompts:
+                logger.debug("LLM prompt: %s", prompt)
+
+    def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LLM response: %s", response)
+
+LOG_CALLBACK = DebugLogCallbackHandler()
+
+# Parsers and their format instructions depend only on the models, so build them on import
+OUTPUT_PARSER = PydanticOutputParser(pydantic_object=AnalysisResponse)
+BATCH_OUTPUT_PARSER = PydanticOutputParser(pydantic_object=BatchAnalysisResponse)
+FORMAT_INSTRUCTIONS = OUTPUT_PARSER.get_format_instructions()
+BATCH_FORMAT_INSTRUCTIONS = BATCH_OUTPUT_PARSER.get_format_instructions()
+
+def _with_format_instructions(template: PromptTemplate, format_instructions: str) -> PromptTemplate:
+    """Append pre-rendered output format instructions to a prompt template."""
+    return PromptTemplate(
+        template=template.template + "\n{format_instructions}\n",
+        input_variables=template.input_variables,
+        partial_variables={"format_instructions": format_instructions}
+    )
+
+ANALYSIS_PROMPTS = {
+    issue_type: _with_format_instructions(template, FORMAT_INSTRUCTIONS)
+    for issue_type, template in PROMPT_TEMPLATES.items()
+}
+BATCH_ANALYSIS_PROMPT = BATCH_ANALYSIS_TEMPLATE.partial(format_instructions=BATCH_FORMAT_INSTRUCTIONS)
+
+# Longest serialized field (in bytes) sent to the LLM; large event or metric blobs are cut here
+MAX_PROMPT_FIELD_BYTES = 8192
+
+def _json(value: Any) -> str:
+    """Serialize a value compactly for inclusion in a prompt."""
+    raw = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    if len(raw) > MAX_PROMPT_FIELD_BYTES:
+        # Cut the bytes before decoding; drop any multi-byte character split at the end
+        return raw[:MAX_PROMPT_FIELD_BYTES].decode("utf-8", errors="ignore") + "…"
+    return raw.decode()
+
+def _base_context(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Context shared by every analysis template."""
+    return {
+        "issue_type": issue["type"],
+        "severity": issue["severity"],
+        "resource_type": issue["resource_type"],
+        "resource_name": issue["resource_name"],
+        "namespace": issue["namespace"],
+        "context": _json(issue.get("message", "")),
+        "metrics": _json(issue.get("metrics", {})),
+        "events": _json(issue.get("events", []))
+    }
+
+def _crash_loop_context(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Context for the crash loop template."""
+    context = _base_context(issue)
+    context["restart_count"] = issue.get("restart_count", 0)
+    context["last_state"] = _json(issue.get("last_state", {}))
+    context["current_state"] = _json(issue.get("current_state", {}))
+    return context
+
+def _oom_kill_context(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Context for the OOMKill template."""
+    context = _base_context(issue)
+    context["memory_metrics"] = _json(issue.get("metrics", {}).get("memory", {}))
+    context["container_limits"] = _json(issue.get("container_limits", {}))
+    return context
+
+def _dns_failure_context(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Context for the DNS failure template."""
+    context = _base_context(issue)
+    context["dns_metrics"] = context["metrics"]
+    context["network_config"] = _json(issue.get("network_config", {}))
+    return context
+
+def _cni_failure_context(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Context for the CNI failure template."""
+    context = _base_context(issue)
+    context["network_state"] = _json({
+        "conditions": issue.get("conditions", []),
+        "container_issues": issue.get("container_issues", [])
+    })
+    context["pod_network_config"] = _json(issue.get("pod_network_config", {}))
+    return context
+
+def _pv_mount_context(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Context for the PV mount error template."""
+    context = _base_context(issue)
+    context["volume_details"] = _json(issue.get("conditions", []))
+    context["storage_class"] = _json(issue.get("storage_class", ""))
+    return context
+
+def _hpa_misconfig_context(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Context for the HPA misconfiguration template."""
+    context = _base_context(issue)
+    context["hpa_config"] = _json({"target_resource": issue.get("target_resource")})
+    context["scaling_metrics"] = _json(issue.get("current_metrics", {}))
+    return context
+
+# Each formatter fills exactly the input_variables of the matching PROMPT_TEMPLATES entry
+CONTEXT_FORMATTERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "crash_loop": _crash_loop_context,
+    "oom_kill": _oom_kill_context,
+    "dns_failure": _dns_failure_context,
+    "cni_failure": _cni_failure_context,
+    "pv_mount_error": _pv_mount_context,
+    "hpa_misconfig": _hpa_misconfig_context
+}
+
+# Context window per model, in tokens; prompts may use PROMPT_BUDGET_RATIO of it
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4-1106-preview": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-3.5-turbo": 16385
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+PROMPT_BUDGET_RATIO = 0.6
+
+# Context fields that may be cut, in order, when a prompt is over budget;
+# the type-specific blobs only exist for some templates
+TRUNCATABLE_FIELDS = (
+    "events", "metrics", "dns_metrics", "memory_metrics",
+    "scaling_metrics", "volume_details", "network_state"
+)
+
 class LLMReasoningEngine:
-    def __init__(self, openai_api_key: str, model_name: str = "gpt-4-1106-preview"):
+    def __init__(
+        self,
+        openai_api_key: str,
+        model_name: str = "gpt-4-1106-preview",
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         """Initialize the reasoning engine with OpenAI credentials."""
         self.llm = ChatOpenAI(
             openai_api_key=openai_api_key,
             model_name=model_name,
             temperature=0.1
         )
-        self.output_parser = PydanticOutputParser(pydantic_object=AnalysisResponse)
+        self.embeddings = OpenAIEmbeddings(openai_api_key=openai_api_key)
+        
+        if http_client is not None:
+            # Route async completions and embeddings through the shared, pooled client
+            async_openai = openai.AsyncOpenAI(api_key=openai_api_key, http_client=http_client)
+            self.llm.async_client = async_openai.chat.completions
+            self.embeddings.async_client = async_openai.embeddings
+        self.output_parser = OUTPUT_PARSER
+        self.batch_output_parser = BATCH_OUTPUT_PARSER
+        
+        # Token budget for a rendered prompt, leaving the rest of the window for the answer
+        try:
+            self.encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("cl100k_base")
+        self.prompt_budget = int(
+            MODEL_CONTEXT_WINDOWS.get(model_name, DEFAULT_CONTEXT_WINDOW) * PROMPT_BUDGET_RATIO
+        )
+        
+        # Chains are stateless between calls, so build them once
+        self.analysis_chains = {
+            issue_type: LLMChain(
+                llm=self.llm,
+                prompt=prompt,
+                output_parser=self.output_parser,
+                callbacks=[LOG_CALLBACK]
+            )
+            for issue_type, prompt in ANALYSIS_PROMPTS.items()
+        }
+        self.batch_chain = LLMChain(
+            llm=self.llm,
+            prompt=BATCH_ANALYSIS_PROMPT,
+            output_parser=self.batch_output_parser,
+            callbacks=[LOG_CALLBACK]
+        )
+        self.fix_chain = LLMChain(
+            llm=self.llm,
+            prompt=FIX_GENERATION_TEMPLATE,
+            callbacks=[LOG_CALLBACK]
+        )
         
     def _format_context(self, issue: Dict[str, Any]) -> Dict[str, str]:
         """Format the issue context for the prompt template."""
-        context = {
-            "issue_type": issue["type"],
-            "severity": issue["severity"],
-            "resource_type": issue["resource_type"],
-            "resource_name": issue["resource_name"],
-            "namespace": issue["namespace"],
-            "context": json.dumps(issue.get("message", ""), indent=2),
-            "metrics": json.dumps(issue.get("metrics", {}), indent=2),
-            "events": json.dumps(issue.get("events", []), indent=2)
-        }
+        formatter = CONTEXT_FORMATTERS.get(issue["type"], _base_context)
+        return formatter(issue)
         
-        # Add issue-specific context
-        if issue["type"] == "crash_loop":
-            context.update({
-                "restart_count": issue.get("restart_count", 0),
-                "last_state": json.dumps(issue.get("last_state", {}), indent=2),
-                "current_state": json.dumps(issue.get("current_state", {}), indent=2)
-            })
-        elif issue["type"] == "oom_kill":
-            context.update({
-                "memory_metrics": json.dumps(issue.get("metrics", {}).get("memory", {}), indent=2),
-                "container_limits": json.dumps(issue.get("container_limits", {}), indent=2)
-            })
-            
+    def _fit_to_budget(self, prompt: PromptTemplate, context: Dict[str, Any], budget: int) -> Dict[str, Any]:
+        """Cut the middle out of large context fields until the rendered prompt fits budget tokens."""
+        excess = len(self.encoding.encode(prompt.format(**context))) - budget
+        for field in TRUNCATABLE_FIELDS:
+            if excess <= 0:
+                break
+            if field not in context:
+                continue
+            tokens = self.encoding.encode(context[field])
+            keep = max(len(tokens) - excess, 0)
+            if keep >= len(tokens):
+                continue
+            # Keep the oldest and newest entries and say how much was dropped
+            head = keep // 2
+            omitted = len(tokens) - keep
+            context[field] = (
+                self.encoding.decode(tokens[:head]) +
+                f" ...[{omitted} tokens truncated]... " +
+                self.encoding.decode(tokens[len(tokens) - (keep - head):])
+            )
+            excess -= omitted
+        if excess > 0:
+            logger.warning(f"Prompt still exceeds its {budget}-token budget by about {excess} tokens")
         return context
         
     async def analyze_issue(self, issue: Dict[str, Any]) -> AnalysisResponse:
         """Analyze an issue using LangChain and OpenAI."""
         try:
-            # Get the appropriate template
-            template = PROMPT_TEMPLATES.get(issue["type"])
-            if not template:
+            # Get the appropriate chain
+            chain = self.analysis_chains.get(issue["type"])
+            if not chain:
                 raise ValueError(f"No template found for issue type: {issue['type']}")
                 
-            # Format the context
-            context = self._format_context(issue)
-            
-            # Create and run the chain
-            chain = LLMChain(
-                llm=self.llm,
-                prompt=template,
-                output_parser=self.output_parser,
-                verbose=True
-            )
+            # Format the context, trimmed to the model's prompt budget
+            context = self._fit_to_budget(chain.prompt, self._format_context(issue), self.prompt_budget)
             
             # Get the analysis
             response = await chain.arun(**context)
@@ -98,31 +280,43 @@ class LLMReasoningEngine:
             logger.error(f"Error analyzing issue: {e}")
             raise
             
-    async def generate_fix(self, analysis: AnalysisResponse) -> Dict[str, Any]:
-        """Generate specific fix based on the analysis."""
+    async def analyze_issues_batch(self, issues: List[Dict[str, Any]]) -> List[AnalysisResponse]:
+        """Analyze several issues with a single LLM call."""
+        if len(issues) == 1:
+            return [await self.analyze_issue(issues[0])]
+            
         try:
-            fix_template = PromptTemplate(
-                template="""Based on the following analysis, generate specific fixes in YAML/Terraform format:
-
-Root Cause: {root_cause}
-Impact: {impact}
-
-Required Changes:
-{remediation_steps}
-
-Generate the necessary configuration changes to implement these fixes.
-Include both the original and modified configurations, along with validation steps.
-""",
-                input_variables=["root_cause", "impact", "remediation_steps"]
+            # Render each issue with its own template and an equal share of the budget
+            section_budget = (
+                self.prompt_budget - len(self.encoding.encode(BATCH_FORMAT_INSTRUCTIONS))
+            ) // len(issues)
+            sections = []
+            for i, issue in enumerate(issues, 1):
+                template = PROMPT_TEMPLATES.get(issue["type"])
+                if not template:
+                    raise ValueError(f"No template found for issue type: {issue['type']}")
+                context = self._fit_to_budget(template, self._format_context(issue), section_budget)
+                sections.append(f"### Issue {i}\n{template.format(**context)}")
+                
+            response = await self.batch_chain.arun(
+                issue_count=len(issues),
+                issues="\n\n".join(sections)
             )
             
-            fix_chain = LLMChain(
-                llm=self.llm,
-                prompt=fix_template,
-                verbose=True
-            )
+            if len(response.analyses) != len(issues):
+                raise ValueError(
+                    f"Expected {len(issues)} analyses, got {len(response.analyses)}"
+                )
+            return response.analyses
+            
+        except Exception as e:
+            logger.error(f"Error analyzing issue batch: {e}")
+            raise
             
-            fixes = await fix_chain.arun(
+    async def generate_fix(self, analysis: AnalysisResponse) -> Dict[str, Any]:
+        """Generate specific fix based on the analysis."""
+        try:
+            fixes = await self.fix_chain.arun(
                 root_cause=analysis.root_cause.cause,
                 impact=analysis.root_cause.impact,
                 remediation_steps="\n".join(
@@ -1,32 +1,88 @@
-from prometheus_api_client import PrometheusConnect
 from grafana_loki_client import LokiClient
 from typing import Dict, List, Optional, Any
+from collections import defaultdict
+from cachetools import TTLCache
+import asyncio
+import httpx
 import logging
+from .single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# PromQL templates; callers fill in labels with str.format
+POD_CPU_QUERY = 'sum by (pod) (rate(container_cpu_usage_seconds_total{{namespace="{namespace}"}}[5m]))'
+POD_MEMORY_QUERY = 'max by (pod) (container_memory_usage_bytes{{namespace="{namespace}"}})'
+POD_PACKET_DROP_QUERY = 'sum by (pod) (rate(container_network_receive_packets_dropped_total{{namespace="{namespace}"}}[5m]))'
+DNS_SERVFAIL_RATE_QUERY = 'sum(rate(coredns_dns_responses_total{rcode="SERVFAIL"}[5m]))'
+DNS_P95_LATENCY_QUERY = 'histogram_quantile(0.95, sum(rate(coredns_dns_request_duration_seconds_bucket[5m])) by (le))'
+
 class MetricsCollector:
-    def __init__(self, prometheus_url: str, loki_url: str):
+    def __init__(self, prometheus_url: str, loki_url: str, metrics_ttl: int = 30):
         """Initialize connections to Prometheus and Loki."""
-        self.prom = PrometheusConnect(url=prometheus_url, disable_ssl=True)
+        # One pooled HTTP/2 connection carries every Prometheus query
+        self.prom = httpx.AsyncClient(
+            base_url=prometheus_url,
+            http2=True,
+            verify=False,
+            headers={"Accept-Encoding": "gzip"},
+            timeout=30
+        )
         self.loki = LokiClient(loki_url)
+        # PromQL expression -> result, so checks repeated across a scan share one query
+        self._queries = SingleFlight(TTLCache(maxsize=4096, ttl=metrics_ttl))
+        # namespace -> pod -> metrics, shared by every check within a scan
+        self._namespace_metrics: TTLCache = TTLCache(maxsize=1024, ttl=metrics_ttl)
+        # One fetch per namespace at a time; other callers wait for its result
+        self._fetch_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        
+    async def close(self):
+        """Close the Prometheus connection pool."""
+        await self.prom.aclose()
+        
+    async def query(self, expr: str) -> List[Dict[str, Any]]:
+        """Run an instant PromQL query, sharing results for identical expressions."""
+        return await self._queries.do(expr, lambda: self._fetch(expr))
+        
+    async def _fetch(self, expr: str) -> List[Dict[str, Any]]:
+        """Run an instant PromQL query and return its result vector."""
+        # POST keeps long expressions out of the URL
+        response = await self.prom.post("/api/v1/query", data={"query": expr})
+        response.raise_for_status()
+        return response.json()["data"]["result"]
+        
+    async def multi_query(self, exprs: List[str]) -> List[List[Dict[str, Any]]]:
+        """Run several PromQL queries concurrently over the shared connection."""
+        return await asyncio.gather(*(self.query(expr) for expr in exprs))
         
-    def get_pod_metrics(self, pod_name: str, namespace: str) -> Dict[str, Any]:
+    async def get_namespace_pod_metrics(self, namespace: str) -> Dict[str, Dict[str, Any]]:
+        """Get resource metrics for every pod in a namespace, keyed by pod name."""
+        async with self._fetch_locks[namespace]:
+            cached = self._namespace_metrics.get(namespace)
+            if cached is not None:
+                return cached
+                
+            try:
+                cpu_samples, memory_samples = await self.multi_query([
+                    POD_CPU_QUERY.format(namespace=namespace),
+                    POD_MEMORY_QUERY.format(namespace=namespace)
+                ])
+                
+                metrics: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"cpu": [], "memory": []})
+                for sample in cpu_samples:
+                    metrics[sample["metric"].get("pod")]["cpu"].append(sample)
+                for sample in memory_samples:
+                    metrics[sample["metric"].get("pod")]["memory"].append(sample)
+                metrics = dict(metrics)
+            except Exception as e:
+                logger.error(f"Error getting metrics for namespace {namespace}: {e}")
+                return {}
+                
+            self._namespace_metrics[namespace] = metrics
+            return metrics
+        
+    async def get_pod_metrics(self, pod_name: str, namespace: str) -> Dict[str, Any]:
         """Get resource metrics for a specific pod."""
-        try:
-            cpu_query = f'container_cpu_usage_seconds_total{{pod="{pod_name}", namespace="{namespace}"}}'
-            memory_query = f'container_memory_usage_bytes{{pod="{pod_name}", namespace="{namespace}"}}'
-            
-            cpu_metrics = self.prom.custom_query(cpu_query)
-            memory_metrics = self.prom.custom_query(memory_query)
-            
-            return {
-                "cpu": cpu_metrics,
-                "memory": memory_metrics
-            }
-        except Exception as e:
-            logger.error(f"Error getting metrics for pod {pod_name}: {e}")
-            return {}
+        return (await self.get_namespace_pod_metrics(namespace)).get(pod_name, {})
             
     def get_pod_logs(self, pod_name: str, namespace: str, hours: int = 1) -> List[Dict[str, Any]]:
         """Get logs from Loki for a specific pod."""
@@ -1,8 +1,29 @@
 from typing import Dict, List, Optional, Any
+from contextlib import closing
+import asyncio
 import logging
+import re
+from .metrics_collector import POD_PACKET_DROP_QUERY, DNS_SERVFAIL_RATE_QUERY, DNS_P95_LATENCY_QUERY
 
 logger = logging.getLogger(__name__)
 
+DNS_ERRORS = (
+    "dial tcp: lookup",
+    "Could not resolve host",
+    "Name or service not known",
+    "temporary error in name resolution",
+    "nslookup failed"
+)
+
+# One pass over the raw log buffer finds any of the DNS error strings
+DNS_ERROR_RE = re.compile("|".join(map(re.escape, DNS_ERRORS)))
+
+# Lowercase substrings of a container message that point at the CNI plugin
+CNI_KEYWORDS = ("network", "cni", "ip allocation")
+
+# (type, status) of a pod condition reporting that scheduling failed
+POD_SCHEDULED_FALSE = ("PodScheduled", "False")
+
 class NetworkIssueDetector:
     """Detect network-related issues in Kubernetes clusters."""
     
@@ -10,32 +31,37 @@ class NetworkIssueDetector:
         self.k8s = k8s_client
         self.metrics = metrics_collector
         
-    def detect_dns_failures(self, pod_name: str, namespace: str) -> Optional[Dict[str, Any]]:
+    def _find_dns_errors(self, pod_name: str, namespace: str, limit: int = 5) -> List[str]:
+        """Stream a pod's recent logs and collect up to limit lines with DNS errors."""
+        found_errors = []
+        with closing(self.k8s.iter_pod_logs(pod_name, namespace)) as chunks:
+            for logs in chunks:
+                pos = 0
+                while len(found_errors) < limit and (match := DNS_ERROR_RE.search(logs, pos)):
+                    # Expand the hit to its enclosing line and resume after it
+                    start = logs.rfind("\n", 0, match.start()) + 1
+                    end = logs.find("\n", match.end())
+                    if end == -1:
+                        end = len(logs)
+                    found_errors.append(logs[start:end])
+                    pos = end + 1
+                if len(found_errors) >= limit:
+                    break
+        return found_errors
+        
+    async def detect_dns_failures(self, pod_name: str, namespace: str) -> Optional[Dict[str, Any]]:
         """Detect DNS resolution failures."""
         # Check pod logs for DNS errors
-        logs = self.k8s.get_pod_logs(pod_name, namespace)
-        dns_errors = [
-            "dial tcp: lookup",
-            "Could not resolve host",
-            "Name or service not known",
-            "temporary error in name resolution",
-            "nslookup failed"
-        ]
+        found_errors = await asyncio.to_thread(self._find_dns_errors, pod_name, namespace)
         
-        found_errors = []
-        for line in logs.split("\n"):
-            for error in dns_errors:
-                if error in line:
-                    found_errors.append(line)
-                    
         if found_errors:
             # Check coredns metrics if available
-            dns_metrics = self.metrics.get_pod_metrics("coredns", "kube-system")
+            dns_metrics = await self.metrics.get_pod_metrics("coredns", "kube-system")
             
             return {
                 "type": "dns_failure",
                 "severity": "high",
-                "logs": found_errors[:5],  # Include up to 5 relevant log lines
+                "logs": found_errors,  # Up to 5 relevant log lines
                 "metrics": dns_metrics,
                 "message": "DNS resolution failures detected"
             }
@@ -48,23 +74,21 @@ class NetworkIssueDetector:
         # Check pod conditions
         for condition in pod_state["conditions"]:
             if (
-                condition["type"] == "PodScheduled" and
-                condition["status"] == "False" and
-                "network" in condition.get("message", "").lower()
+                (condition.type, condition.status) == POD_SCHEDULED_FALSE and
+                "network" in (condition.message or "").lower()
             ):
-                network_conditions.append(condition)
+                network_conditions.append(condition._asdict())
                 
         # Check container states for network-related issues
         network_issues = []
         for container in pod_state["container_states"]:
-            if (
-                container["state"]["type"] == "waiting" and
-                any(err in container["state"].get("message", "").lower() 
-                    for err in ["network", "cni", "ip allocation"])
-            ):
+            if container.state_type != "waiting":
+                continue
+            message = (container.message or "").lower()
+            if any(keyword in message for keyword in CNI_KEYWORDS):
                 network_issues.append({
-                    "container": container["name"],
-                    "message": container["state"]["message"]
+                    "container": container.name,
+                    "message": container.message
                 })
                 
         if network_conditions or network_issues:
@@ -77,51 +101,45 @@ class NetworkIssueDetector:
             }
         return None
         
-    def check_network_metrics(self, namespace: str) -> List[Dict[str, Any]]:
+    async def check_network_metrics(self, namespace: str) -> List[Dict[str, Any]]:
         """Check network-related metrics for potential issues."""
         issues = []
         
         try:
-            # Query Prometheus for network metrics
-            network_metrics = self.metrics.prom.custom_query(
-                'sum(rate(container_network_receive_packets_dropped_total{namespace="' + 
-                namespace + '"}[5m])) by (pod) > 0'
+            # Drop rate for every pod; the threshold is applied client-side below
+            network_metrics = await self.metrics.query(
+                POD_PACKET_DROP_QUERY.format(namespace=namespace)
             )
             
-            if network_metrics:
-                for metric in network_metrics:
-                    pod_name = metric["metric"]["pod"]
-                    drop_rate = float(metric["value"][1])
+            for metric in network_metrics:
+                drop_rate = float(metric["value"][1])
+                
+                if drop_rate > 0.1:  # More than 10% packet drop rate
+                    issues.append({
+                        "type": "network_performance",
+                        "severity": "medium",
+                        "resource_name": metric["metric"]["pod"],
+                        "metrics": {
+                            "packet_drop_rate": drop_rate
+                        },
+                        "message": f"High packet drop rate detected: {drop_rate:.2%}"
+                    })
                     
-                    if drop_rate > 0.1:  # More than 10% packet drop rate
-                        issues.append({
-                            "type": "network_performance",
-                            "severity": "medium",
-                            "resource_name": pod_name,
-                            "metrics": {
-                                "packet_drop_rate": drop_rate
-                            },
-                            "message": f"High packet drop rate detected: {drop_rate:.2%}"
-                        })
-                        
         except Exception as e:
             logger.error(f"Error checking network metrics: {e}")
             
         return issues
         
-    def analyze_dns_metrics(self, namespace: str) -> List[Dict[str, Any]]:
+    async def analyze_dns_metrics(self, namespace: str) -> List[Dict[str, Any]]:
         """Analyze DNS-related metrics for potential issues."""
         issues = []
         
         try:
-            # Query DNS error and latency metrics
-            dns_error_rate = self.metrics.prom.custom_query(
-                'sum(rate(coredns_dns_responses_total{rcode="SERVFAIL"}[5m]))'
-            )
-            
-            dns_latency = self.metrics.prom.custom_query(
-                'histogram_quantile(0.95, sum(rate(coredns_dns_request_duration_seconds_bucket[5m])) by (le))'
-            )
+            # Query DNS error and latency metrics together
+            dns_error_rate, dns_latency = await self.metrics.multi_query([
+                DNS_SERVFAIL_RATE_QUERY,
+                DNS_P95_LATENCY_QUERY
+            ])
             
             if dns_error_rate and float(dns_error_rate[0]["value"][1]) > 0.01:
                 issues.append({
@@ -156,4 +156,32 @@ PROMPT_TEMPLATES = {
         ],
         template=HPA_MISCONFIG_TEMPLATE
     )
-}
\ No newline at end of file
+}
+
+# Template for analyzing several issues in a single LLM call
+BATCH_ANALYSIS_TEMPLATE = PromptTemplate(
+    input_variables=["issue_count", "issues", "format_instructions"],
+    template="""You will analyze {issue_count} independent Kubernetes cluster issues.
+Treat each issue separately and return exactly one analysis per issue, in the same order.
+
+{issues}
+
+{format_instructions}
+"""
+)
+
+# Template for turning an analysis into concrete configuration changes
+FIX_GENERATION_TEMPLATE = PromptTemplate(
+    input_variables=["root_cause", "impact", "remediation_steps"],
+    template="""Based on the following analysis, generate specific fixes in YAML/Terraform format:
+
+Root Cause: {root_cause}
+Impact: {impact}
+
+Required Changes:
+{remediation_steps}
+
+Generate the necessary configuration changes to implement these fixes.
+Include both the original and modified configurations, along with validation steps.
+"""
+)
\ No newline at end of file
@@ -1,120 +1,372 @@
-from typing import Dict, List, Optional, Union, Any
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union, Any
+from functools import cached_property
+from cachetools import LRUCache
+import copy
+import hashlib
 import yaml
-import json
-from python_terraform import Terraform
+import orjson
 import tempfile
 import os
+import atexit
+import shutil
+import subprocess
+import threading
 import logging
 from kubernetes import client, utils
-from jinja2 import Template
+from kubernetes.client.rest import ApiException
+from jinja2 import Environment, Template
 
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml bindings; fall back to the pure-Python implementations
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# Diagnostic text terraform validate uses when the workspace needs (re-)initializing
+TF_INIT_KEYWORDS = (
+    "terraform init",
+    "missing required provider",
+    "not installed",
+    "inconsistent dependency lock file"
+)
+
+# Strategic merge keys for the list fields remediations touch, in order of preference;
+# any other list is replaced as a whole
+LIST_MERGE_KEYS = {
+    "containers": ("name",),
+    "initContainers": ("name",),
+    "env": ("name",),
+    "volumes": ("name",),
+    "imagePullSecrets": ("name",),
+    "volumeMounts": ("mountPath",),
+    "volumeDevices": ("devicePath",),
+    "ports": ("containerPort", "port")  # container ports, then Service ports
+}
+
+# Typed API classes and method suffixes (patch_namespaced_<suffix>, create_namespaced_<suffix>)
+# for the kinds remediations usually touch, keyed by (apiVersion, kind)
+TYPED_RESOURCES = {
+    ("v1", "ConfigMap"): (client.CoreV1Api, "config_map"),
+    ("v1", "PersistentVolumeClaim"): (client.CoreV1Api, "persistent_volume_claim"),
+    ("v1", "Pod"): (client.CoreV1Api, "pod"),
+    ("v1", "Secret"): (client.CoreV1Api, "secret"),
+    ("v1", "Service"): (client.CoreV1Api, "service"),
+    ("v1", "ServiceAccount"): (client.CoreV1Api, "service_account"),
+    ("apps/v1", "DaemonSet"): (client.AppsV1Api, "daemon_set"),
+    ("apps/v1", "Deployment"): (client.AppsV1Api, "deployment"),
+    ("apps/v1", "ReplicaSet"): (client.AppsV1Api, "replica_set"),
+    ("apps/v1", "StatefulSet"): (client.AppsV1Api, "stateful_set"),
+    ("autoscaling/v1", "HorizontalPodAutoscaler"): (client.AutoscalingV1Api, "horizontal_pod_autoscaler"),
+    ("autoscaling/v2", "HorizontalPodAutoscaler"): (client.AutoscalingV2Api, "horizontal_pod_autoscaler"),
+    ("batch/v1", "CronJob"): (client.BatchV1Api, "cron_job"),
+    ("batch/v1", "Job"): (client.BatchV1Api, "job"),
+    ("networking.k8s.io/v1", "Ingress"): (client.NetworkingV1Api, "ingress"),
+    ("networking.k8s.io/v1", "NetworkPolicy"): (client.NetworkingV1Api, "network_policy"),
+}
+
+def _typed_key_value(value: Any) -> Dict[str, str]:
+    """Encode a non-JSON value for a cache key along with its type.
+    
+    SafeDumper writes e.g. a datetime and its ISO string differently, so the two
+    must not produce the same key.
+    """
+    return {"__type__": type(value).__qualname__, "value": str(value)}
+
+class YamlPatch(Mapping):
+    """A generated YAML patch whose YAML text is only emitted when first read."""
+    
+    _KEYS = ("original", "patched", "warnings", "validation_commands")
+    
+    def __init__(
+        self,
+        original_resource: Dict[str, Any],
+        patched_resource: Dict[str, Any],
+        warnings: List[str],
+        dump_original: Callable[[Dict[str, Any]], str]
+    ):
+        self.original_resource = original_resource
+        self.patched_resource = patched_resource
+        self.warnings = warnings
+        self.validation_commands = [
+            "kubectl diff -f <file>",
+            "kubectl apply --dry-run=server -f <file>"
+        ]
+        self._dump_original = dump_original
+        
+    @cached_property
+    def original(self) -> str:
+        """YAML text of the original resource."""
+        return self._dump_original(self.original_resource)
+        
+    @cached_property
+    def patched(self) -> str:
+        """YAML text of the patched resource."""
+        return yaml.dump(self.patched_resource, Dumper=SafeDumper, default_flow_style=False)
+        
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+        
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+        
+    def __len__(self) -> int:
+        return len(self._KEYS)
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Emit both YAML documents and return the patch as a plain dict."""
+        return {key: self[key] for key in self._KEYS}
+
 class RemediationGenerator:
+    # Kinds and namespaces whose changes always need a human review
+    _DANGEROUS_KINDS = frozenset({"Node", "Namespace"})
+    _SYSTEM_NAMESPACES = frozenset({"kube-system", "kube-public", "kube-node-lease"})
+    
     def __init__(self, k8s_client: client.ApiClient):
         """Initialize the remediation generator."""
         self.k8s_client = k8s_client
-        self.terraform = Terraform()
+        # Persistent, initialized workspace shared by every Terraform validation
+        self._tf_workspace: Optional[str] = None
+        self._tf_lock = threading.Lock()
+        # Patches render to JSON and HCL, never HTML, so autoescape only costs time
+        self._jinja_env = Environment(
+            autoescape=False,
+            auto_reload=False,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        # Compiled templates keyed by a digest of their source
+        self._templates: LRUCache = LRUCache(maxsize=256)
+        # YAML renderings of original resources keyed by a digest of their content
+        self._original_yaml: LRUCache = LRUCache(maxsize=512)
+        # Digests of Terraform content that already passed validation; guarded by _tf_lock
+        self._validated: LRUCache = LRUCache(maxsize=1024)
+        # Apply runs in worker threads and cachetools caches are not thread-safe;
+        # guards _templates and _original_yaml, never held while compiling or dumping
+        self._cache_lock = threading.Lock()
+        # Bound typed (patch, create) methods, sharing one API object per group
+        apis: Dict[type, Any] = {}
+        self._typed_methods = {}
+        for key, (api_class, suffix) in TYPED_RESOURCES.items():
+            api = apis.setdefault(api_class, api_class(k8s_client))
+            self._typed_methods[key] = (
+                getattr(api, f"patch_namespaced_{suffix}"),
+                getattr(api, f"create_namespaced_{suffix}")
+            )
         
-    def _validate_yaml(self, yaml_content: str) -> bool:
-        """Validate YAML syntax and basic Kubernetes resource structure."""
-        try:
-            # Parse YAML
-            resources = list(yaml.safe_load_all(yaml_content))
+    def _get_template(self, source: str) -> Template:
+        """Compile a template string once and reuse it for identical sources."""
+        key = hashlib.blake2b(source.encode(), digest_size=8).digest()
+        with self._cache_lock:
+            template = self._templates.get(key)
+        if template is None:
+            template = self._jinja_env.from_string(source)
+            with self._cache_lock:
+                self._templates[key] = template
+        return template
+        
+    def _dump_original(self, resource: Dict[str, Any]) -> str:
+        """Dump an original resource to YAML once per distinct content."""
+        encoded = orjson.dumps(
+            resource,
+            default=_typed_key_value,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_SUBCLASS | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        key = hashlib.blake2b(encoded, digest_size=16).digest()
+        with self._cache_lock:
+            original_yaml = self._original_yaml.get(key)
+        if original_yaml is None:
+            original_yaml = yaml.dump(resource, Dumper=SafeDumper, default_flow_style=False)
+            with self._cache_lock:
+                self._original_yaml[key] = original_yaml
+        return original_yaml
+        
+    @staticmethod
+    def _check_resource(resource: Any):
+        """Raise ValueError unless resource has the basic Kubernetes object structure."""
+        if not isinstance(resource, dict):
+            raise ValueError("Resource must be a dictionary")
             
-            # Basic validation
-            for resource in resources:
-                if not isinstance(resource, dict):
-                    raise ValueError("Resource must be a dictionary")
-                    
-                required_fields = ["apiVersion", "kind", "metadata"]
-                for field in required_fields:
-                    if field not in resource:
-                        raise ValueError(f"Resource missing required field: {field}")
-                        
-            return True
-        except Exception as e:
-            logger.error(f"YAML validation failed: {e}")
-            return False
+        required_fields = ["apiVersion", "kind", "metadata"]
+        for field in required_fields:
+            if field not in resource:
+                raise ValueError(f"Resource missing required field: {field}")
+                
+    @staticmethod
+    def _run_terraform(workspace: str, *args: str) -> Tuple[int, str, str]:
+        """Run a terraform subcommand in a workspace and return (return_code, stdout, stderr)."""
+        # Read the live environment so values loaded after import (.env) reach terraform;
+        # drop debug logging and disable interactive prompts
+        env = {key: value for key, value in os.environ.items() if key != "TF_LOG"}
+        env.update(TF_IN_AUTOMATION="1", TF_INPUT="0")
+        result = subprocess.run(
+            ["terraform", f"-chdir={workspace}", *args],
+            capture_output=True,
+            text=True,
+            check=False,
+            env=env
+        )
+        return result.returncode, result.stdout, result.stderr
+        
+    def _terraform_workspace(self) -> str:
+        """Create and initialize the shared validation workspace on first use."""
+        if self._tf_workspace is None:
+            # Keep the directory even if init fails so later calls reuse it
+            self._tf_workspace = tempfile.mkdtemp(prefix="kubefix-tf-")
+            atexit.register(shutil.rmtree, self._tf_workspace, ignore_errors=True)
+            self._run_terraform(self._tf_workspace, "init", "-backend=false")
+        return self._tf_workspace
+        
+    @staticmethod
+    def _terraform_diagnostics(stdout: str) -> List[Dict[str, Any]]:
+        """Extract the diagnostics from `terraform validate -json` output."""
+        try:
+            return orjson.loads(stdout).get("diagnostics", [])
+        except ValueError:
+            return []
             
+    @staticmethod
+    def _needs_init(diagnostics: List[Dict[str, Any]]) -> bool:
+        """Check whether validation failed because providers or modules are not installed."""
+        return any(
+            keyword in f"{d.get('summary', '')} {d.get('detail', '')}".lower()
+            for d in diagnostics
+            for keyword in TF_INIT_KEYWORDS
+        )
+        
     def _validate_terraform(self, tf_content: str) -> bool:
         """Validate Terraform configuration syntax."""
+        key = hashlib.blake2b(tf_content.encode(), digest_size=16).digest()
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Write content to temporary file
-                tf_file = os.path.join(temp_dir, "main.tf")
-                with open(tf_file, "w") as f:
+            with self._tf_lock:
+                # Repeats of content that already validated skip the subprocess entirely
+                if key in self._validated:
+                    return True
+                    
+                workspace = self._terraform_workspace()
+                with open(os.path.join(workspace, "main.tf"), "w") as f:
                     f.write(tf_content)
                     
-                # Run terraform init and validate
-                self.terraform.init(temp_dir)
-                return_code, stdout, stderr = self.terraform.validate(temp_dir)
+                return_code, stdout, stderr = self._run_terraform(workspace, "validate", "-json")
+                diagnostics = self._terraform_diagnostics(stdout)
+                if return_code != 0 and self._needs_init(diagnostics):
+                    # The content needs providers the workspace has not installed yet;
+                    # init is incremental, so only new providers are fetched
+                    self._run_terraform(workspace, "init", "-backend=false")
+                    return_code, stdout, stderr = self._run_terraform(workspace, "validate", "-json")
+                    diagnostics = self._terraform_diagnostics(stdout)
                 
                 if return_code != 0:
-                    logger.error(f"Terraform validation failed: {stderr}")
+                    errors = "; ".join(d.get("summary", "") for d in diagnostics) or stderr
+                    logger.error(f"Terraform validation failed: {errors}")
                     return False
                     
+                self._validated[key] = True
             return True
         except Exception as e:
             logger.error(f"Terraform validation failed: {e}")
             return False
             
-    def _validate_resource_safety(self, resource: Dict[str, Any]) -> List[str]:
-        """Check for potentially dangerous operations."""
+    @classmethod
+    def _deep_merge(cls, dst: Dict[str, Any], src: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge src into dst in place, the way a strategic merge patch would."""
+        for key, value in src.items():
+            current = dst.get(key)
+            merge_key = (
+                cls._list_merge_key(key, current, value)
+                if isinstance(current, list) and isinstance(value, list) else None
+            )
+            if isinstance(current, dict) and isinstance(value, dict):
+                cls._deep_merge(current, value)
+            elif merge_key is not None:
+                # Items with a matching merge key are merged, new ones appended
+                by_key = {item[merge_key]: item for item in current}
+                for item in value:
+                    if item[merge_key] in by_key:
+                        cls._deep_merge(by_key[item[merge_key]], item)
+                    else:
+                        current.append(item)
+            else:
+                dst[key] = value
+        return dst
+        
+    @staticmethod
+    def _list_merge_key(field: str, current: List[Any], value: List[Any]) -> Optional[str]:
+        """Pick the strategic merge key for a list field, or None to replace the list."""
+        for merge_key in LIST_MERGE_KEYS.get(field, ()):
+            keys = [item.get(merge_key) if isinstance(item, dict) else None for item in current]
+            new_keys = [item.get(merge_key) if isinstance(item, dict) else None for item in value]
+            # Only merge when every item carries the key and it is unique on both sides
+            if (
+                None not in keys and None not in new_keys
+                and len(set(keys)) == len(keys) and len(set(new_keys)) == len(new_keys)
+            ):
+                return merge_key
+        return None
+        
+    def _review_resource(self, resource: Any) -> Tuple[bool, List[str]]:
+        """Validate a resource's structure and collect safety warnings in one pass."""
+        try:
+            self._check_resource(resource)
+        except ValueError as e:
+            logger.error(f"Resource validation failed: {e}")
+            return False, []
+            
         warnings = []
+        kind = resource["kind"]
+        metadata = resource["metadata"] or {}
         
         # Check for dangerous operations
-        dangerous_kinds = ["Node", "Namespace"]
-        if resource["kind"] in dangerous_kinds:
-            warnings.append(f"Operation affects {resource['kind']} - requires careful review")
+        if kind in self._DANGEROUS_KINDS:
+            warnings.append(f"Operation affects {kind} - requires careful review")
+            
+        # Check for system namespaces
+        namespace = metadata.get("namespace")
+        if namespace in self._SYSTEM_NAMESPACES:
+            warnings.append(f"Operation affects system namespace {namespace}")
             
         # Check for deletion operations
-        if resource.get("metadata", {}).get("deletionTimestamp"):
+        if metadata.get("deletionTimestamp"):
             warnings.append("Operation involves deletion - requires careful review")
             
-        # Check for system namespaces
-        system_namespaces = ["kube-system", "kube-public", "kube-node-lease"]
-        if resource.get("metadata", {}).get("namespace") in system_namespaces:
-            warnings.append(f"Operation affects system namespace {resource['metadata']['namespace']}")
-            
-        return warnings
+        return True, warnings
         
     def generate_yaml_patch(
         self,
         original_resource: Dict[str, Any],
         changes: Dict[str, Any],
         template_vars: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> YamlPatch:
         """Generate a YAML patch for Kubernetes resources."""
         try:
-            # Create patch template
-            patch_template = Template(json.dumps(changes))
-            
-            # Apply template variables
-            rendered_changes = json.loads(
-                patch_template.render(**(template_vars or {}))
-            )
+            if template_vars:
+                # Render template variables into the changes through a compact JSON template
+                patch_template = self._get_template(
+                    orjson.dumps(changes, option=orjson.OPT_SORT_KEYS).decode()
+                )
+                rendered_changes = orjson.loads(patch_template.render(**template_vars))
+            else:
+                # Nothing to substitute; copy so the patch never shares objects with the caller
+                rendered_changes = copy.deepcopy(changes)
             
-            # Create the patched resource
-            patched_resource = {**original_resource, **rendered_changes}
+            # Create the patched resource, merging nested fields instead of replacing them
+            patched_resource = copy.deepcopy(original_resource)
+            self._deep_merge(patched_resource, rendered_changes)
             
-            # Validate the patched resource
-            yaml_content = yaml.dump(patched_resource)
-            if not self._validate_yaml(yaml_content):
+            # Validate the patched resource and check for safety concerns
+            valid, warnings = self._review_resource(patched_resource)
+            if not valid:
                 raise ValueError("Generated YAML patch is invalid")
                 
-            # Check for safety concerns
-            warnings = self._validate_resource_safety(patched_resource)
-            
-            return {
-                "original": yaml.dump(original_resource),
-                "patched": yaml_content,
-                "warnings": warnings,
-                "validation_commands": [
-                    f"kubectl diff -f <file>",
-                    f"kubectl apply --dry-run=server -f <file>"
-                ]
-            }
+            # YAML for both documents is emitted only if a caller reads it, from private
+            # snapshots so later changes to the caller's objects do not show through
+            return YamlPatch(
+                copy.deepcopy(original_resource), patched_resource, warnings, self._dump_original
+            )
             
         except Exception as e:
             logger.error(f"Error generating YAML patch: {e}")
@@ -129,7 +381,7 @@ class RemediationGenerator:
         """Generate a Terraform patch."""
         try:
             # Create patch template
-            patch_template = Template(changes["resource_block"])
+            patch_template = self._get_template(changes["resource_block"])
             
             # Apply template variables
             rendered_changes = patch_template.render(**(template_vars or {}))
@@ -155,6 +407,79 @@ class RemediationGenerator:
             logger.error(f"Error generating Terraform patch: {e}")
             raise
             
+    def _create_from_yaml_text(
+        self,
+        content: str,
+        namespace: Optional[str] = None,
+        dry_run: bool = True
+    ) -> Any:
+        """Write a manifest to a temporary file and create its objects in the cluster."""
+        # create_from_yaml only reads paths; write the encoded bytes with raw os.write
+        fd, path = tempfile.mkstemp(suffix=".yaml")
+        try:
+            data = memoryview(content.encode("utf-8"))
+            try:
+                while data:
+                    data = data[os.write(fd, data):]
+            finally:
+                os.close(fd)
+                
+            return utils.create_from_yaml(
+                self.k8s_client,
+                path,
+                namespace=namespace,
+                dry_run=dry_run
+            )
+        finally:
+            os.unlink(path)
+            
+    def _apply_manifest(
+        self,
+        content: str,
+        namespace: Optional[str] = None,
+        dry_run: bool = True,
+        applied: Optional[List[str]] = None
+    ) -> Any:
+        """Apply a manifest with typed patch/create calls, falling back to create_from_yaml.
+        
+        Documents are applied in order and the first failure raises; on the typed path
+        each document applied before it is recorded in applied as kind/namespace/name.
+        """
+        resources = [r for r in yaml.load_all(content, Loader=SafeLoader) if r is not None]
+        # Pre-apply check on the parsed documents; the ValueError names the problem
+        for resource in resources:
+            self._check_resource(resource)
+            
+        methods = [self._typed_methods.get((r["apiVersion"], r["kind"])) for r in resources]
+        if not resources or None in methods:
+            # Unknown kinds go through the generic, dynamically dispatched path
+            return self._create_from_yaml_text(content, namespace=namespace, dry_run=dry_run)
+            
+        results = []
+        for resource, (patch, create) in zip(resources, methods):
+            name = resource["metadata"]["name"]
+            resource_namespace = resource["metadata"].get("namespace") or namespace or "default"
+            try:
+                result = patch(
+                    name=name,
+                    namespace=resource_namespace,
+                    body=resource,
+                    dry_run="All" if dry_run else None
+                )
+            except ApiException as e:
+                if e.status != 404:
+                    raise
+                # Nothing to patch yet; the remediation introduces this object
+                result = create(
+                    namespace=resource_namespace,
+                    body=resource,
+                    dry_run="All" if dry_run else None
+                )
+            results.append(result)
+            if applied is not None:
+                applied.append(f"{resource['kind']}/{resource_namespace}/{name}")
+        return results
+        
     def apply_yaml_patch(
         self,
         patch_content: str,
@@ -162,31 +487,27 @@ class RemediationGenerator:
         dry_run: bool = True
     ) -> Dict[str, Any]:
         """Apply a YAML patch to the cluster."""
+        applied: List[str] = []
         try:
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
-                tmp.write(patch_content)
-                tmp.flush()
-                
-                # Apply the patch
-                return_value = utils.create_from_yaml(
-                    self.k8s_client,
-                    tmp.name,
-                    namespace=namespace,
-                    dry_run=dry_run
-                )
-                
-                return {
-                    "success": True,
-                    "affected_resources": return_value,
-                    "dry_run": dry_run
-                }
-                
+            return_value = self._apply_manifest(
+                patch_content,
+                namespace=namespace,
+                dry_run=dry_run,
+                applied=applied
+            )
+            
+            return {
+                "success": True,
+                "affected_resources": return_value,
+                "dry_run": dry_run
+            }
+            
         except Exception as e:
             logger.error(f"Error applying YAML patch: {e}")
             return {
                 "success": False,
                 "error": str(e),
+                "applied_resources": applied,
                 "dry_run": dry_run
             }
             
@@ -203,20 +524,17 @@ class RemediationGenerator:
                 f.write(tf_content)
                 
             # Initialize Terraform
-            self.terraform.init(workspace_dir)
+            self._run_terraform(workspace_dir, "init")
             
             if dry_run:
                 # Run plan
-                return_code, stdout, stderr = self.terraform.plan(
-                    workspace_dir,
-                    detailed_exitcode=True
+                return_code, stdout, stderr = self._run_terraform(
+                    workspace_dir, "plan", "-detailed-exitcode"
                 )
             else:
                 # Apply changes
-                return_code, stdout, stderr = self.terraform.apply(
-                    workspace_dir,
-                    skip_plan=True,
-                    auto_approve=True
+                return_code, stdout, stderr = self._run_terraform(
+                    workspace_dir, "apply", "-auto-approve"
                 )
                 
             return {
@@ -1,80 +1,101 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any
 from kubernetes import client, config, watch
 from datetime import datetime, timezone
+from operator import itemgetter
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+class ContainerState(NamedTuple):
+    """Flattened current state of one container in a pod."""
+    name: str
+    ready: bool
+    restart_count: int
+    state_type: Optional[str] = None  # "running", "waiting" or "terminated"
+    reason: Optional[str] = None
+    message: Optional[str] = None
+    exit_code: Optional[int] = None
+
+class PodCondition(NamedTuple):
+    """One entry of a pod's status conditions."""
+    type: str
+    status: str
+    reason: Optional[str] = None
+    message: Optional[str] = None
+
 class ResourceMonitor:
     """Monitor Kubernetes resources and collect state information."""
     
-    def __init__(self, k8s_client: 'KubernetesClient'):
+    def __init__(self, k8s_client: 'KubernetesClient', metrics_ttl: float = 15):
         self.k8s = k8s_client
+        self.metrics_ttl = metrics_ttl
+        # plural -> (monotonic fetch time, metrics indexed by name or (namespace, name))
+        self._metrics_cache: Dict[str, Tuple[float, Dict[Any, Dict[str, Any]]]] = {}
         
     def get_pod_state(self, pod) -> Dict[str, Any]:
         """Analyze pod state and extract relevant information."""
-        containers = pod.status.container_statuses if pod.status.container_statuses else []
+        status = pod.status
+        # Compact tuple records; callers convert with _asdict() only when serializing
         container_states = []
-        
-        for container in containers:
-            state = {
-                "name": container.name,
-                "ready": container.ready,
-                "restart_count": container.restart_count,
-                "state": None,
-                "last_state": None
-            }
-            
-            # Current state
-            if container.state.running:
-                state["state"] = {"type": "running", "started_at": container.state.running.started_at}
-            elif container.state.waiting:
-                state["state"] = {
-                    "type": "waiting",
-                    "reason": container.state.waiting.reason,
-                    "message": container.state.waiting.message
-                }
-            elif container.state.terminated:
-                state["state"] = {
-                    "type": "terminated",
-                    "reason": container.state.terminated.reason,
-                    "exit_code": container.state.terminated.exit_code,
-                    "message": container.state.terminated.message
-                }
-                
-            container_states.append(state)
+        append = container_states.append
+        for container in status.container_statuses or []:
+            # Each model attribute goes through a property; read every one once
+            name, ready, restart_count = container.name, container.ready, container.restart_count
+            state = container.state
+            running, waiting, terminated = state.running, state.waiting, state.terminated
+            if running is not None:
+                append(ContainerState(name, ready, restart_count, "running"))
+            elif waiting is not None:
+                append(ContainerState(
+                    name, ready, restart_count, "waiting",
+                    waiting.reason, waiting.message
+                ))
+            elif terminated is not None:
+                append(ContainerState(
+                    name, ready, restart_count, "terminated",
+                    terminated.reason, terminated.message, terminated.exit_code
+                ))
+            else:
+                append(ContainerState(name, ready, restart_count))
             
+        start_time = status.start_time
         return {
             "name": pod.metadata.name,
             "namespace": pod.metadata.namespace,
-            "phase": pod.status.phase,
+            "phase": status.phase,
             "conditions": [
-                {
-                    "type": condition.type,
-                    "status": condition.status,
-                    "reason": getattr(condition, "reason", None),
-                    "message": getattr(condition, "message", None)
-                }
-                for condition in pod.status.conditions or []
+                PodCondition(condition.type, condition.status, condition.reason, condition.message)
+                for condition in status.conditions or ()
             ],
             "container_states": container_states,
-            "host_ip": pod.status.host_ip,
-            "pod_ip": pod.status.pod_ip,
-            "qos_class": pod.status.qos_class,
-            "nominated_node_name": pod.status.nominated_node_name,
-            "start_time": pod.status.start_time.isoformat() if pod.status.start_time else None
+            "host_ip": status.host_ip,
+            "pod_ip": status.pod_ip,
+            "qos_class": status.qos_class,
+            "nominated_node_name": status.nominated_node_name,
+            "start_time": start_time.isoformat() if start_time else None
         }
         
+    def _indexed_metrics(self, plural: str, key) -> Dict[Any, Dict[str, Any]]:
+        """List all metrics of one kind at most once per TTL and index them by key."""
+        cached = self._metrics_cache.get(plural)
+        if cached and time.monotonic() - cached[0] < self.metrics_ttl:
+            return cached[1]
+            
+        # metrics.k8s.io ignores field selectors, so one full list serves every lookup
+        metrics = self.k8s.custom_objects.list_cluster_custom_object(
+            group="metrics.k8s.io",
+            version="v1beta1",
+            plural=plural
+        )
+        index = {key(item["metadata"]): item for item in metrics.get("items", [])}
+        self._metrics_cache[plural] = (time.monotonic(), index)
+        return index
+        
     def get_node_metrics(self, node_name: str) -> Dict[str, Any]:
         """Get node resource metrics."""
         try:
-            metrics = self.k8s.custom_objects.list_cluster_custom_object(
-                group="metrics.k8s.io",
-                version="v1beta1",
-                plural="nodes",
-                field_selector=f"metadata.name={node_name}"
-            )
-            return metrics.get("items", [{}])[0]
+            return self._indexed_metrics("nodes", itemgetter("name")).get(node_name, {})
         except Exception as e:
             logger.error(f"Error getting metrics for node {node_name}: {e}")
             return {}
@@ -82,14 +103,9 @@ class ResourceMonitor:
     def get_pod_metrics(self, name: str, namespace: str) -> Dict[str, Any]:
         """Get pod resource metrics."""
         try:
-            metrics = self.k8s.custom_objects.list_namespaced_custom_object(
-                group="metrics.k8s.io",
-                version="v1beta1",
-                namespace=namespace,
-                plural="pods",
-                field_selector=f"metadata.name={name}"
-            )
-            return metrics.get("items", [{}])[0]
+            return self._indexed_metrics(
+                "pods", itemgetter("namespace", "name")
+            ).get((namespace, name), {})
         except Exception as e:
             logger.error(f"Error getting metrics for pod {namespace}/{name}: {e}")
             return {}
\ No newline at end of file
@@ -0,0 +1,32 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, MutableMapping
+import asyncio
+
+class SingleFlight:
+    """Run at most one computation per key at a time and cache successful results."""
+
+    def __init__(self, cache: MutableMapping):
+        self.cache = cache
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, or join or start its computation."""
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+
+        # Concurrent callers for the same key share a single computation
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        # Shield so one caller being cancelled does not cancel the others
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        """Drop a finished computation from the in-flight map, caching its result."""
+        del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self.cache[key] = task.result()